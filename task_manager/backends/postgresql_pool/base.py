@@ -0,0 +1,80 @@
+"""PostgreSQL backend that borrows its connections from a psycopg_pool connection pool.
+
+Configured like the stock backend, with the pool's own arguments (min_size, max_size, timeout...)
+under ``OPTIONS['pool']``. Closing a connection, which Django does at the end of every request
+when ``CONN_MAX_AGE`` is 0, hands it back to the pool rather than disconnecting, so each worker
+keeps a bounded set of warm connections shared by all of its threads.
+"""
+from threading import Lock
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql import base, creation
+
+try:
+    from psycopg_pool import ConnectionPool
+except ImportError as error:
+    raise ImproperlyConfigured(
+        "The pooled PostgreSQL backend needs psycopg 3 and psycopg_pool; install requirements-postgres.txt."
+    ) from error
+
+_pools = {}
+_pools_lock = Lock()
+
+
+def close_pools(dbname=None):
+    """Close the pools connected to the named database, or all of them, disconnecting their connections."""
+
+    with _pools_lock:
+        for key in [key for key in _pools if dbname is None or key[1] == dbname]:
+            _pools.pop(key).close()
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # A database cannot be dropped while the pool still holds connections to it.
+        close_pools(test_database_name)
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        conn_params.pop('pool', None)
+        return conn_params
+
+    @property
+    def pool(self):
+        """Return the pool for this connection's database, opening it on first use."""
+
+        conn_params = self.get_connection_params()
+        # The test runner renames the database after connecting, so pools are told apart by target.
+        key = tuple(conn_params.get(name) for name in ('dbname', 'host', 'port', 'user'))
+        key = (self.alias, *key)
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = ConnectionPool(
+                    kwargs=conn_params,
+                    check=ConnectionPool.check_connection,
+                    open=True,
+                    **self.settings_dict['OPTIONS'].get('pool', {}),
+                )
+            return pool
+
+    def get_new_connection(self, conn_params):
+        options = self.settings_dict['OPTIONS']
+        isolation_level = options.get('isolation_level', base.IsolationLevel.READ_COMMITTED)
+        try:
+            self.isolation_level = base.IsolationLevel(isolation_level)
+        except ValueError:
+            raise ImproperlyConfigured(f"Invalid transaction isolation level {options['isolation_level']} specified.")
+        connection = self.pool.getconn()
+        if 'isolation_level' in options:
+            connection.isolation_level = self.isolation_level
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.putconn(self.connection)
@@ -0,0 +1,80 @@
+"""Cache settings read from the environment, so each deployment can pick where cached data lives.
+
+``CACHE_URL`` selects the backend:
+
+* ``locmem://`` (the default): an in-process cache evicting the least recently used entries first,
+  sized by ``?max_entries=``.
+* ``file:///var/cache/task_manager``: files in a directory, shared by the processes of one machine
+  (a relative path is taken from the project directory).
+* ``redis://host:6379/0``: a Redis server, shared by every machine, needing the ``redis`` package.
+* ``fakeredis://``: the Redis backend talking to an in-process fake server from ``fakeredis``, to
+  run the Redis code path without a Redis server.
+* ``dummy://``: no caching at all.
+
+``CACHE_KEY_PREFIX`` keeps the keys of deployments sharing a server apart, and raising
+``CACHE_VERSION`` retires every cached entry at once, for example after changing what is cached.
+"""
+from pathlib import Path
+from urllib.parse import parse_qsl, unquote, urlsplit
+from django.core.exceptions import ImproperlyConfigured
+
+BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'rediss': 'django.core.cache.backends.redis.RedisCache',
+    'fakeredis': 'django.core.cache.backends.redis.RedisCache',
+    'dummy': 'django.core.cache.backends.dummy.DummyCache',
+}
+CULLING_OPTIONS = ('max_entries', 'cull_frequency')
+
+
+def parse_cache_url(url, base_dir):
+    """Return the ``CACHES`` entry described by a cache URL."""
+
+    parts = urlsplit(url)
+    if parts.scheme not in BACKENDS:
+        raise ImproperlyConfigured(f"Unsupported CACHE_URL scheme {parts.scheme!r}; use one of {', '.join(BACKENDS)}.")
+    config = {'BACKEND': BACKENDS[parts.scheme]}
+    if parts.scheme in ('redis', 'rediss'):
+        # redis-py reads the server, database and any connection options from the URL itself.
+        config['LOCATION'] = url
+        return config
+    if parts.scheme == 'fakeredis':
+        try:
+            from fakeredis import FakeConnection
+        except ImportError as error:
+            raise ImproperlyConfigured("A fakeredis CACHE_URL needs the fakeredis package.") from error
+        # Every client of the fake server at this address shares its data, as with a real server.
+        config['LOCATION'] = 'redis://localhost:6379/0'
+        config['OPTIONS'] = {'connection_class': FakeConnection}
+        return config
+
+    options = {}
+    for name, value in parse_qsl(parts.query):
+        if name not in CULLING_OPTIONS:
+            raise ImproperlyConfigured(f"Unsupported CACHE_URL option {name!r}; use one of {', '.join(CULLING_OPTIONS)}.")
+        try:
+            options[name.upper()] = int(value)
+        except ValueError:
+            raise ImproperlyConfigured(f"CACHE_URL option {name} must be a number, not {value!r}.")
+    if options:
+        config['OPTIONS'] = options
+    if parts.scheme == 'file':
+        path = unquote(parts.netloc + parts.path)
+        if not path:
+            raise ImproperlyConfigured("A file CACHE_URL needs a directory, for example file:///var/cache/task_manager.")
+        config['LOCATION'] = str(Path(base_dir) / path)
+    return config
+
+def cache_settings(environ, base_dir):
+    """Return the default ``CACHES`` entry configured by the environment, an in-process cache when nothing is set."""
+
+    config = parse_cache_url(environ.get('CACHE_URL') or 'locmem://', base_dir)
+    config['KEY_PREFIX'] = environ.get('CACHE_KEY_PREFIX', 'task_manager')
+    version = environ.get('CACHE_VERSION', '1')
+    try:
+        config['VERSION'] = int(version)
+    except ValueError:
+        raise ImproperlyConfigured(f"CACHE_VERSION must be a number, not {version!r}.")
+    return config
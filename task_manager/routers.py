@@ -0,0 +1,64 @@
+"""Database router sending the reads of read-only views to a replica, when one is configured.
+
+``tasks.middleware.ReplicaRoutingMiddleware`` marks each request to a view in
+``settings.REPLICA_VIEWS`` as replica-safe, unless the user wrote within the last
+``settings.REPLICA_PIN_SECONDS`` and so must read their own writes from the primary. Everything
+else, writes and reads outside such requests, goes to the primary.
+"""
+from contextlib import contextmanager
+from threading import local
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+WRITE_STATEMENTS = {'INSERT', 'UPDATE', 'DELETE', 'REPLACE'}
+
+_current = local()
+
+
+class RequestRouting:
+    """Whether the request being handled may read from the replica, and whether it has written yet."""
+
+    def __init__(self):
+        self.use_replica = False
+        self.wrote = False
+
+    def __call__(self, execute, sql, params, many, context):
+        """Notice writes to the primary, as a database execute wrapper."""
+
+        if not self.wrote and sql.lstrip().split(None, 1)[0].upper() in WRITE_STATEMENTS:
+            self.wrote = True
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def request_routing():
+    """Route the queries of the request handled within the block, yielding its ``RequestRouting``."""
+
+    routing = _current.routing = RequestRouting()
+    try:
+        with connections[DEFAULT_DB_ALIAS].execute_wrapper(routing):
+            yield routing
+    finally:
+        _current.routing = None
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        routing = getattr(_current, 'routing', None)
+        if (
+            routing is None or not routing.use_replica or routing.wrote
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return settings.REPLICA_DATABASE
+
+    def db_for_write(self, model, **hints):
+        # Explicitly, as Django would otherwise save an instance read from the replica back to it.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its tables from the primary.
+        return db != settings.REPLICA_DATABASE
@@ -0,0 +1,51 @@
+"""Session and message storage read from the environment, trading consistency for fewer queries.
+
+``SESSION_STORE`` selects where sessions live:
+
+* ``db`` (the default): every request using the session reads its row, and changing it writes the
+  row. Always consistent, at the cost of a query per request.
+* ``cached_db``: sessions are read from the cache, falling back to the database, and written to
+  both. Saves the read on most requests. Only consistent when every process shares the cache
+  (``CACHE_URL`` pointing at Redis, or at files on a single machine): with the default in-process
+  cache, a change made by one process, such as logging out, is not seen by the others until their
+  cached copy expires.
+* ``cache``: sessions live in the cache only, so no queries at all, but users are logged out
+  whenever their session is evicted or the cache restarts. Needs a shared, persistent cache.
+* ``signed_cookies``: sessions live in a cookie signed with ``SECRET_KEY``, so no queries and no
+  storage. The client can read (but not alter) the session, which must stay under 4 KB, and
+  logging out cannot revoke a copy of the cookie taken earlier.
+
+``MESSAGE_STORE`` selects where messages wait for the next page: ``fallback`` (the default) keeps
+them in a signed cookie and only spills over into the session when they do not fit, ``cookie``
+uses the cookie alone, and ``session`` saves the session for every message.
+"""
+from django.core.exceptions import ImproperlyConfigured
+
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+MESSAGE_STORAGES = {
+    'fallback': 'django.contrib.messages.storage.fallback.FallbackStorage',
+    'cookie': 'django.contrib.messages.storage.cookie.CookieStorage',
+    'session': 'django.contrib.messages.storage.session.SessionStorage',
+}
+
+
+def _choice(environ, name, choices, default):
+    value = environ.get(name) or default
+    if value not in choices:
+        raise ImproperlyConfigured(f"Unsupported {name} {value!r}; use one of {', '.join(choices)}.")
+    return choices[value]
+
+def session_engine(environ):
+    """Return the ``SESSION_ENGINE`` configured by the environment, the database when nothing is set."""
+
+    return _choice(environ, 'SESSION_STORE', SESSION_ENGINES, 'db')
+
+def message_storage(environ):
+    """Return the ``MESSAGE_STORAGE`` configured by the environment, cookies falling back to the session when nothing is set."""
+
+    return _choice(environ, 'MESSAGE_STORE', MESSAGE_STORAGES, 'fallback')
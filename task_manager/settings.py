@@ -10,8 +10,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 from django.contrib.messages import constants as messages
+from task_manager.cache import cache_settings
+from task_manager.database import database_settings, sqlite_pragmas
+from task_manager.sessions import message_storage, session_engine
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -43,6 +47,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'tasks.middleware.InstrumentationMiddleware',
+    'tasks.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -50,13 +56,14 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'tasks.middleware.QueryBudgetMiddleware',
 ]
 
 ROOT_URLCONF = 'task_manager.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'tasks.instrumentation.InstrumentedDjangoTemplates',
         'DIRS': [],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -77,13 +84,16 @@ WSGI_APPLICATION = 'task_manager.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# Configured from DATABASE_URL and friends, see task_manager/database.py; SQLite by default.
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_settings(os.environ, BASE_DIR),
 }
 
+# Pragmas set on every new SQLite connection, turned on with DATABASE_SQLITE_TUNING=1 for
+# single-node deployments; PRAGMA optimize is run every SQLITE_OPTIMIZE_INTERVAL seconds.
+SQLITE_PRAGMAS = sqlite_pragmas(os.environ)
+SQLITE_OPTIMIZE_INTERVAL = 3600
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -136,7 +146,83 @@ LOGIN_URL = 'log_in'
 # URL where @login_prohibited redirects to
 REDIRECT_URL_WHEN_LOGGED_IN = 'dashboard'
 
+# Notifications are fanned out from domain events (see tasks/events.py). The 'thread' dispatcher
+# delivers them on a background worker once the request's transaction commits; 'inline' delivers
+# them straight away, which the test suite relies on (see task_manager/test_settings.py).
+NOTIFICATION_DISPATCH = 'thread'
+NOTIFICATION_BATCH_SIZE = 500
+
+# Query budgets (see tasks/middleware.py): the most queries a request to each URL name may run,
+# counting inline notification delivery to the small teams of the test fixtures. A request also
+# breaks its budget when it repeats the same query shape QUERY_BUDGET_REPEAT_THRESHOLD times, the
+# mark of an N+1 pattern. Breaking a budget is logged while developing, and fails the test suite.
+QUERY_BUDGET_ENABLED = DEBUG
+QUERY_BUDGET_ACTION = 'log'
+QUERY_BUDGET_REPEAT_THRESHOLD = 3
+QUERY_BUDGET_DEFAULT = None
+QUERY_BUDGETS = {
+    'dashboard': 6,
+    'dashboard_task_rows': 3,
+    'show_team': 9,
+    'team_task_rows': 6,
+    'archived_task_rows': 6,
+    'leaderboard': 3,
+    'create_team': 13,
+    'edit_team': 4,
+    'team_delete': 8,
+    'invite': 14,
+    'list_invitations': 6,
+    'accept_invitation': 17,
+    'decline_invitation': 11,
+    'create_task': 5,
+    'edit_task': 5,
+    'delete_task': 6,
+    'assign_member_to_task': 10,
+    'task_toggle': 12,
+    'toggle_archive': 5,
+    'notifications': 7,
+    'seen_notification': 6,
+}
+
+# Configured from CACHE_URL and friends, see task_manager/cache.py; an in-process LRU cache by
+# default. Cached data is keyed on the cache version of the team or user it derives from (see
+# tasks/caching.py): fragments of the team page for TEAM_FRAGMENT_CACHE_TIMEOUT seconds, and each
+# user's unseen notifications for UNSEEN_NOTIFICATIONS_CACHE_TIMEOUT.
+CACHES = {
+    'default': cache_settings(os.environ, BASE_DIR),
+}
+TEAM_FRAGMENT_CACHE_TIMEOUT = 3600
+UNSEEN_NOTIFICATIONS_CACHE_TIMEOUT = 3600
+
+# Request instrumentation (see tasks/instrumentation.py): the timings of the last
+# INSTRUMENTATION_WINDOW requests to each URL name are shown to staff at /stats/, and when
+# INSTRUMENTATION_DUMP_PATH is set the running totals are written there in the Prometheus text
+# format at most every INSTRUMENTATION_DUMP_INTERVAL seconds.
+INSTRUMENTATION_ENABLED = True
+INSTRUMENTATION_WINDOW = 1000
+INSTRUMENTATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+INSTRUMENTATION_DUMP_PATH = os.environ.get('INSTRUMENTATION_DUMP_PATH')
+INSTRUMENTATION_DUMP_INTERVAL = 15
+
 # Convert Django ERROR messages to Bootstrap DANGER messages
 MESSAGE_TAGS = {
     messages.ERROR: 'danger',
 }
+
+# Where sessions and messages are kept, configured from SESSION_STORE and MESSAGE_STORE; see
+# task_manager/sessions.py for what each choice saves and gives up.
+SESSION_ENGINE = session_engine(os.environ)
+MESSAGE_STORAGE = message_storage(os.environ)
+
+# Read replica (see task_manager/routers.py): with DATABASE_REPLICA_URL set, reads of the views in
+# REPLICA_VIEWS go to the replica, except for REPLICA_PIN_SECONDS after the user last wrote.
+DATABASE_ROUTERS = ['task_manager.routers.ReplicaRouter']
+REPLICA_DATABASE = None
+if os.environ.get('DATABASE_REPLICA_URL'):
+    REPLICA_DATABASE = 'replica'
+    DATABASES['replica'] = database_settings({**os.environ, 'DATABASE_URL': os.environ['DATABASE_REPLICA_URL']}, BASE_DIR)
+REPLICA_VIEWS = (
+    'dashboard', 'dashboard_task_rows', 'show_team', 'team_task_rows', 'archived_task_rows', 'leaderboard',
+    'notifications', 'list_invitations',
+)
+REPLICA_PIN_SECONDS = 10
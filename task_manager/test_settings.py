@@ -0,0 +1,31 @@
+"""Settings for the test suite, on top of task_manager/settings.py.
+
+``manage.py test`` uses them unless told otherwise; other test runners should be pointed at them
+with ``DJANGO_SETTINGS_MODULE=task_manager.test_settings``.
+"""
+
+from task_manager.settings import *  # noqa: F401,F403
+from task_manager.settings import BASE_DIR, DATABASES, REPLICA_DATABASE
+from task_manager.cache import cache_settings
+from task_manager.database import database_settings
+from task_manager.sessions import message_storage, session_engine
+
+# Deliver notifications within the request, so that tests see them as soon as it returns.
+NOTIFICATION_DISPATCH = 'inline'
+
+# Breaking a query budget fails the test that made the request.
+QUERY_BUDGET_ENABLED = True
+QUERY_BUDGET_ACTION = 'raise'
+
+# No cache, except in the tests of caching, and the default sessions in the database and messages
+# in cookies, whatever the environment configures.
+CACHES = {
+    'default': cache_settings({'CACHE_URL': 'dummy://'}, BASE_DIR),
+}
+SESSION_ENGINE = session_engine({})
+MESSAGE_STORAGE = message_storage({})
+
+# Without a configured replica, an empty SQLite replica of the suite's own, used by the tests that
+# turn routing on.
+if REPLICA_DATABASE is None and DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    DATABASES['replica'] = database_settings({'DATABASE_URL': 'sqlite:///db-replica.sqlite3'}, BASE_DIR)
@@ -26,6 +26,7 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('', views.home, name='home'),
     path('dashboard/', views.dashboard, name='dashboard'),
+    path('dashboard/tasks', views.dashboard_task_rows, name='dashboard_task_rows'),
     path('log_in/', views.LogInView.as_view(), name='log_in'),
     path('log_out/', views.log_out, name='log_out'),
     path('password/', views.PasswordView.as_view(), name='password'),
@@ -34,6 +35,8 @@ urlpatterns = [
     path('create_team/', views.CreateTeamView.as_view(), name='create_team'),
     path('team/<int:team_id>', views.show_team, name='show_team'),
     path('team/<int:team_id>/invite/', views.invite, name='invite'),
+    path('team/<int:team_id>/tasks', views.team_task_rows, name='team_task_rows'),
+    path('team/<int:team_id>/archived_tasks', views.archived_task_rows, name='archived_task_rows'),
     path('invitations/', views.list_invitations, name='list_invitations'),
     path('invitations/accept/<int:invitation_id>/', views.accept_invitation, name='accept_invitation'),
     path('invitations/decline/<int:invitation_id>/', views.decline_invitation, name='decline_invitation'),
@@ -48,6 +51,7 @@ urlpatterns = [
     path('leaderboard/<int:team_id>', views.leaderboard_view, name='leaderboard'),
     path('seen_notification/<int:notification_id>', views.seen_notification, name="seen_notification"),
     path('delete/<int:team_id>', views.DeleteTeamView.as_view(), name='team_delete'),
+    path('stats/', views.request_stats_view, name='request_stats'),
 ]
 
 handler404 = 'tasks.views.custom_404'
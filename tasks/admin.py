@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import User, Team, Invitation, Task, Notification
+from .models import User, Team, Invitation, Task, Notification, TeamMemberScore
 
 # Register your models here.
 @admin.register(User) # our model we created
@@ -52,3 +52,12 @@ class NotificationAdmin(admin.ModelAdmin):
     list_display = [
         'title', 'description', 'created_at', 'actionable', 'id', 'user', 'invitation', 'seen'
     ]
+
+@admin.register(TeamMemberScore)
+class TeamMemberScoreAdmin(admin.ModelAdmin):
+    """Configuration of the admin interface for team member scores."""
+
+    # List of attributes you want to see in the table view of team member scores
+    list_display = [
+        'team', 'user', 'points'
+    ]
@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class TasksConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tasks'
+
+    def ready(self):
+        from . import signals
+        from task_manager.database import tune_sqlite_connection
+        connection_created.connect(tune_sqlite_connection, dispatch_uid='tune_sqlite_connection')
@@ -0,0 +1,21 @@
+"""Keys of cached data derived from a team or a user, versioned so that nothing ever has to be deleted.
+
+Teams and users carry a ``cache_version`` which is bumped whenever something cached for them
+changes: the signal handlers in tasks/signals.py bump a team's after edits to its tasks, members or
+itself, and refreshing a user's unseen notification count bumps theirs. A key embeds the version, so
+after a bump the entries cached for an older version are simply never looked up again and age out
+of the cache, first of all in an LRU cache. The same scheme works unchanged on every cache backend.
+"""
+from django.db.models import F
+from .models import Team
+
+
+def versioned_key(instance, name):
+    """Return the cache key of some data derived from a team or user, for its current cache version."""
+
+    return f'{instance._meta.model_name}:{instance.pk}:v{instance.cache_version}:{name}'
+
+def bump_team_versions(team_ids):
+    """Invalidate the cached data of the given teams, given as ids or a queryset of ids."""
+
+    Team.objects.filter(pk__in=team_ids).update(cache_version=F('cache_version') + 1)
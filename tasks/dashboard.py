@@ -0,0 +1,60 @@
+"""Data shown on a user's dashboard, loaded in a fixed number of queries however many tasks they have."""
+from django.db.models import BooleanField, Count, ExpressionWrapper, Q
+from django.utils import timezone
+from .models import Task, Team
+from .pagination import paginate_tasks
+
+LATE_SUMMARY_LENGTH = 10
+
+
+def dashboard_tasks(user, cursor=None, now=None):
+    """Return a page of the tasks assigned to a user, soonest due first, each with its team and an ``is_late`` flag."""
+
+    now = now or timezone.now()
+    tasks = (
+        Task.objects
+        .filter(assigned_members=user)
+        .select_related('author')
+        .annotate(is_late=ExpressionWrapper(Q(due_date__lt=now), output_field=BooleanField()))
+    )
+    return paginate_tasks(tasks, cursor)
+
+def dashboard_task_counts(user, now=None):
+    """Return how many tasks are assigned to a user, and how many of those are late."""
+
+    now = now or timezone.now()
+    return Task.objects.filter(assigned_members=user).aggregate(
+        total=Count('pk'),
+        late=Count('pk', filter=Q(due_date__lt=now)),
+    )
+
+def dashboard_teams(user):
+    """Return the teams a user created or is a member of."""
+
+    return list(Team.objects.filter(Q(author=user) | Q(members=user)).distinct())
+
+def late_task_summary(late_tasks, late_count, length=LATE_SUMMARY_LENGTH):
+    """Return the titles of the first few late tasks, mentioning how many more there are."""
+
+    summary = ", ".join(task.title for task in late_tasks[:length])
+    if late_count > length:
+        summary += f" and {late_count - length} more."
+    return summary
+
+def dashboard_context(user):
+    """Return the template context of a user's dashboard.
+
+    Late tasks are due soonest, so the ones named in the summary are always on the first page.
+    """
+
+    now = timezone.now()
+    user_tasks = dashboard_tasks(user, now=now)
+    counts = dashboard_task_counts(user, now=now)
+    late_tasks = [task for task in user_tasks if task.is_late]
+    return {
+        'user_tasks': user_tasks,
+        'user_task_count': counts['total'],
+        'user_teams': dashboard_teams(user),
+        'late_tasks': late_tasks,
+        'late_task_text': late_task_summary(late_tasks, counts['late']),
+    }
@@ -0,0 +1,213 @@
+"""Domain events published by the views and fanned out to their recipients as notifications.
+
+Publishing an event is cheap: it records what happened and hands it to a dispatcher. Working out
+who to notify and inserting their notifications happens when the event is delivered, in batches,
+either straight away or on a background worker depending on ``settings.NOTIFICATION_DISPATCH``.
+"""
+import atexit
+import logging
+from itertools import islice
+from queue import Queue
+from threading import Lock, Thread
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils.text import Truncator
+from .models import Invitation, Notification, Task, Team, User
+from .notifications import invitation_notification, refresh_unseen_notification_counts
+
+logger = logging.getLogger(__name__)
+
+TEAM_CREATED = 'team_created'
+INVITATION_SENT = 'invitation_sent'
+INVITATION_ACCEPTED = 'invitation_accepted'
+INVITATION_DECLINED = 'invitation_declined'
+TASK_ASSIGNED = 'task_assigned'
+TASK_COMPLETED = 'task_completed'
+TASK_OVERDUE = 'task_overdue'
+
+
+class NotificationEvent:
+    """Something that happened which people should be notified about, identified by primary keys."""
+
+    def __init__(self, kind, **data):
+        self.kind = kind
+        self.data = data
+
+    def __repr__(self):
+        return f'NotificationEvent({self.kind!r}, {self.data!r})'
+
+
+def publish(kind, **data):
+    """Publish an event for delivery by the configured dispatcher."""
+
+    get_dispatcher().submit(NotificationEvent(kind, **data))
+
+def deliver(event):
+    """Insert the notifications of an event in batches, then bring the recipients' unseen counters up to date.
+
+    Returns the number of notifications created.
+    """
+
+    notifications = iter(HANDLERS[event.kind](**event.data))
+    batch_size = settings.NOTIFICATION_BATCH_SIZE
+    created = 0
+    while batch := list(islice(notifications, batch_size)):
+        with transaction.atomic():
+            Notification.objects.bulk_create(batch)
+            refresh_unseen_notification_counts(notification.user_id for notification in batch)
+        created += len(batch)
+    return created
+
+
+class InlineDispatcher:
+    """Deliver events as soon as they are published, within the publisher's transaction."""
+
+    def submit(self, event):
+        deliver(event)
+
+    def join(self):
+        pass
+
+
+class NotificationWorker:
+    """Deliver events on a background thread, once the transaction that published them has committed.
+
+    Events are queued in process, so any still waiting are lost if the process is killed.
+    """
+
+    def __init__(self, handle=deliver):
+        self.handle = handle
+        self.queue = Queue()
+        self.lock = Lock()
+        self.thread = None
+
+    def submit(self, event):
+        transaction.on_commit(lambda: self.enqueue(event))
+
+    def enqueue(self, event):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = Thread(target=self.run, name='notification-worker', daemon=True)
+                self.thread.start()
+        self.queue.put(event)
+
+    def run(self):
+        while True:
+            event = self.queue.get()
+            try:
+                self.handle(event)
+            except Exception:
+                logger.exception('Failed to deliver %r', event)
+            finally:
+                close_old_connections()
+                self.queue.task_done()
+
+    def join(self):
+        """Block until every queued event has been delivered."""
+
+        self.queue.join()
+
+
+DISPATCHERS = {
+    'inline': InlineDispatcher,
+    'thread': NotificationWorker,
+}
+_dispatcher = None
+_dispatcher_lock = Lock()
+
+def get_dispatcher():
+    """Return the process-wide dispatcher selected by ``settings.NOTIFICATION_DISPATCH``."""
+
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None or not isinstance(_dispatcher, DISPATCHERS[settings.NOTIFICATION_DISPATCH]):
+            _dispatcher = DISPATCHERS[settings.NOTIFICATION_DISPATCH]()
+            atexit.register(_dispatcher.join)
+        return _dispatcher
+
+
+def _notification(user_id, title, description='', actionable=False, invitation_id=None):
+    """Return an unsaved notification, shortening its text to fit the columns."""
+
+    return Notification(
+        user_id=user_id,
+        title=Truncator(title).chars(Notification._meta.get_field('title').max_length),
+        description=Truncator(description).chars(Notification._meta.get_field('description').max_length),
+        actionable=actionable,
+        invitation_id=invitation_id,
+    )
+
+def _task_recipient_ids(task, exclude=None):
+    """Return the ids of a task's assigned members and of its team's author, without anyone excluded."""
+
+    user_ids = set(
+        Task.assigned_members.through.objects.filter(task=task).values_list('user_id', flat=True)
+    )
+    user_ids.add(task.author.author_id)
+    user_ids.discard(exclude)
+    return sorted(user_ids)
+
+def team_created(team_id, user_id):
+    team = Team.objects.filter(pk=team_id).first()
+    if team is None:
+        return
+    yield _notification(user_id, f"New Team Created: {team.title}", "You have created a new team")
+
+def invitation_sent(invitation_id, user_id):
+    invitation = Invitation.objects.select_related('team').filter(pk=invitation_id).first()
+    if invitation is None or invitation.status != Invitation.INVITED:
+        return
+    if Notification.objects.filter(user_id=user_id, invitation=invitation).exists():
+        return
+    yield invitation_notification(invitation, User(pk=user_id))
+
+def invitation_accepted(invitation_id, user_id):
+    invitation = Invitation.objects.select_related('team').filter(pk=invitation_id).first()
+    if invitation is None:
+        return
+    team = invitation.team
+    yield _notification(user_id, "Joined a team", f"You have joined {team.title}")
+    if team.author_id != user_id:
+        member = User.objects.get(pk=user_id)
+        yield _notification(team.author_id, "New team member", f"{member.full_name()} joined {team.title}")
+
+def invitation_declined(invitation_id, user_id):
+    invitation = Invitation.objects.select_related('team').filter(pk=invitation_id).first()
+    if invitation is None or invitation.team.author_id == user_id:
+        return
+    member = User.objects.get(pk=user_id)
+    yield _notification(
+        invitation.team.author_id, "Invitation declined", f"{member.full_name()} declined {invitation.team.title}"
+    )
+
+def task_assigned(task_id, user_ids, actor_id=None):
+    task = Task.objects.select_related('author').filter(pk=task_id).first()
+    if task is None:
+        return
+    for user_id in user_ids:
+        if user_id != actor_id:
+            yield _notification(user_id, f"Task assigned: {task.title}", f"In {task.author.title}")
+
+def task_completed(task_id, actor_id=None):
+    task = Task.objects.select_related('author').filter(pk=task_id, is_complete=True).first()
+    if task is None:
+        return
+    for user_id in _task_recipient_ids(task, exclude=actor_id):
+        yield _notification(user_id, f"Task completed: {task.title}", f"In {task.author.title}")
+
+def task_overdue(task_id):
+    task = Task.objects.select_related('author').filter(pk=task_id, is_complete=False).first()
+    if task is None:
+        return
+    for user_id in _task_recipient_ids(task):
+        yield _notification(user_id, f"Task overdue: {task.title}", f"In {task.author.title}")
+
+HANDLERS = {
+    TEAM_CREATED: team_created,
+    INVITATION_SENT: invitation_sent,
+    INVITATION_ACCEPTED: invitation_accepted,
+    INVITATION_DECLINED: invitation_declined,
+    TASK_ASSIGNED: task_assigned,
+    TASK_COMPLETED: task_completed,
+    TASK_OVERDUE: task_overdue,
+}
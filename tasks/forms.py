@@ -135,6 +135,7 @@ class TeamInviteForm(forms.Form):
         if not User.objects.filter(email=email).exists():
             raise ValidationError("No user is registered with this email address.")
         user = User.objects.get(email=email)
+        self.invited_user = user
         if self.team.members.filter(id=user.id).exists():
             raise forms.ValidationError("User already in the team.")
         if Invitation.objects.filter(team=self.team, email=email).exists():
@@ -0,0 +1,29 @@
+"""Cached fragments of the team page, keyed on the team's cache version (see tasks/caching.py).
+
+The data behind each fragment is loaded on first use, so a page whose fragments are all cached runs
+no queries for them.
+"""
+from django.conf import settings
+from django.middleware.csrf import get_token
+from django.utils.functional import SimpleLazyObject
+from .helpers import team_task_page
+from .leaderboard import team_leaderboard
+
+
+def team_page_context(request, team):
+    """Return the template context of a team's page, loading the data of each fragment only when it is rendered.
+
+    Fragments holding forms or controls that depend on the viewer are also keyed on the viewer and
+    their CSRF secret, so nobody is served someone else's CSRF token.
+    """
+
+    get_token(request)
+    return {
+        'team': team,
+        'members': SimpleLazyObject(lambda: team_leaderboard(team)),
+        'unarchived': SimpleLazyObject(lambda: team_task_page(team)),
+        'archived': SimpleLazyObject(lambda: team_task_page(team, archived=True)),
+        'team_members': SimpleLazyObject(lambda: list(team.members.all())),
+        'fragment_timeout': settings.TEAM_FRAGMENT_CACHE_TIMEOUT,
+        'viewer_key': f"{request.user.pk}:{request.META['CSRF_COOKIE']}",
+    }
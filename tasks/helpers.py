@@ -1,8 +1,8 @@
 from django.conf import settings
 from django.shortcuts import redirect
 from .models import Team, Task, User
-from django.core.exceptions import ObjectDoesNotExist
-from django.http import Http404
+from .pagination import paginate_tasks
+from django.db.models import Exists, OuterRef, Prefetch
 
 def login_prohibited(view_function):
     """Decorator for view functions that redirect users away if they are logged in."""
@@ -14,52 +14,95 @@ def login_prohibited(view_function):
             return view_function(request)
     return modified_view_function
 
+def get_request_object(request, model, pk):
+    """ Helper function to return a model instance, loading it from the database at most once per request."""
+    objects = request.__dict__.setdefault('_object_cache', {})
+    key = (model._meta.label, int(pk))
+    if key not in objects:
+        objects[key] = model.objects.get(pk=pk)
+    return objects[key]
+
+def remember_request_object(request, instance):
+    """ Helper function to keep an already loaded model instance for reuse later in the request."""
+    objects = request.__dict__.setdefault('_object_cache', {})
+    objects[(instance._meta.label, instance.pk)] = instance
+    return instance
+
+class TeamAccess:
+    """The team (and task) a request refers to, and the current user's standing in that team."""
+
+    def __init__(self, user, team, task=None):
+        self.team = team
+        self.task = task
+        is_team_author = user.is_authenticated and team.author_id == user.pk
+        self.is_member = user.is_authenticated and (team.user_is_member or is_team_author)
+        self.is_author = is_team_author and team.user_is_member
+
+def get_team_access(request, team_id=None, task_id=None):
+    """ Helper function to load the team a request refers to along with the user's membership, in a single query.
+
+    The task is looked up when a task id is given, and its team is loaded alongside it.
+    Returns None when the team or task does not exist. The result is cached on the request
+    so that the view reuses the team and task loaded while authorising it.
+    """
+    cache = request.__dict__.setdefault('_team_access_cache', {})
+    key = (team_id, task_id)
+    if key in cache:
+        return cache[key]
+
+    membership = Team.members.through.objects.filter(user_id=request.user.pk)
+    access = None
+    if task_id is not None:
+        task = (
+            Task.objects
+            .select_related('author__author')
+            .annotate(user_is_member=Exists(membership.filter(team_id=OuterRef('author_id'))))
+            .filter(id=task_id)
+            .first()
+        )
+        if task is not None:
+            task.author.user_is_member = task.user_is_member
+            remember_request_object(request, task)
+            remember_request_object(request, task.author)
+            access = TeamAccess(request.user, task.author, task)
+    elif team_id is not None:
+        team = (
+            Team.objects
+            .select_related('author')
+            .annotate(user_is_member=Exists(membership.filter(team_id=OuterRef('pk'))))
+            .filter(id=team_id)
+            .first()
+        )
+        if team is not None:
+            remember_request_object(request, team)
+            access = TeamAccess(request.user, team)
+
+    cache[key] = access
+    return access
+
 def team_member_prohibited_to_view_team(view_function):
     """ Decorator for view functions that redirect users away if they are not a team member of that team when they want to view team. """
     def modified_view_function(request, *args, **kwargs):
-        current_user = request.user
-
         team_id = kwargs.get('team_id', None)
         task_id = kwargs.get('task_id', None)
 
-        current_team = None
-
-        if team_id != None:
-            try: 
-                current_team = Team.objects.get(id=team_id)
-            except ObjectDoesNotExist:
-                return redirect(settings.REDIRECT_URL_WHEN_LOGGED_IN)
-
-        if task_id != None:
-            try: 
-                current_task = Task.objects.get(id=task_id)
-                current_team = Team.objects.get(id=current_task.author.id)
-            except ObjectDoesNotExist:
-                return redirect(settings.REDIRECT_URL_WHEN_LOGGED_IN)
-
-        if current_user.is_authenticated and (current_user in current_team.members.all() or current_user == current_team.author):
+        access = get_team_access(request, team_id=team_id, task_id=task_id)
+        if access is not None and access.is_member:
             return view_function(request, *args, **kwargs)
         else:
             return redirect(settings.REDIRECT_URL_WHEN_LOGGED_IN)
 
     return modified_view_function
 
-def calculate_task_complete_score(team_id):
-    """ Helper function to calculate the tasks each user has completed."""
-    try:
-        current_team = Team.objects.get(pk=team_id)
-        members = current_team.members.all()
-        tasks = Task.objects.filter(author=current_team)
-        for member in members:
-            member.total_tasks_completed = 0
-            for task in tasks:
-                if task.is_complete and member in task.assigned_members.all():
-                    member.total_tasks_completed += task.points
-                    member.save()
-
-        members = sorted(members, key=lambda m: m.total_tasks_completed, reverse=True)
-        return members, current_team, tasks
-
-    except ObjectDoesNotExist:
-        raise Http404("Team does not exist")
-    
\ No newline at end of file
+def team_task_page(team, archived=False, cursor=None):
+    """ Helper function to load a page of a team's unarchived or archived tasks with their assigned members."""
+    tasks = (
+        Task.objects
+        .filter(author=team, is_archived=archived)
+        .prefetch_related(Prefetch('assigned_members', to_attr='assigned'))
+    )
+    page = paginate_tasks(tasks, cursor)
+    for task in page:
+        task.member_count = len(task.assigned)
+        task.assigned_ids = {member.pk for member in task.assigned}
+    return page
@@ -0,0 +1,206 @@
+"""Per-request timings by URL name: wall time split into database, template and Python time.
+
+The middleware in tasks/middleware.py times each request and records it here. Each process keeps
+its own statistics in memory: the most recent requests to each URL name for the staff stats page,
+and running totals since the process started, which can be written out in the Prometheus text
+format for a node exporter's textfile collector.
+"""
+import os
+import tempfile
+from collections import deque
+from math import ceil
+from threading import Lock, local
+from time import monotonic, perf_counter
+from django.conf import settings
+from django.template.backends.django import DjangoTemplates
+
+_current = local()
+
+
+class RequestTimings:
+    """The time a request has spent so far in the database and rendering templates."""
+
+    def __init__(self):
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.queries = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """Time a query, as a database execute wrapper."""
+
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += perf_counter() - start
+            self.queries += 1
+
+    def __enter__(self):
+        _current.timings = self
+        return self
+
+    def __exit__(self, *exc_info):
+        _current.timings = None
+
+
+def current_timings():
+    """Return the timings of the request being handled by this thread, if any."""
+
+    return getattr(_current, 'timings', None)
+
+
+class RequestSample:
+    """The measurements of one request."""
+
+    def __init__(self, wall_time, db_time, template_time, queries, response_size):
+        self.wall_time = wall_time
+        self.db_time = db_time
+        self.template_time = template_time
+        self.python_time = max(wall_time - db_time - template_time, 0.0)
+        self.queries = queries
+        self.response_size = response_size
+
+
+class ViewStats:
+    """The recent requests to one URL name, and running totals since the process started."""
+
+    TOTALS = ('wall_time', 'db_time', 'template_time', 'python_time', 'queries', 'response_size')
+
+    def __init__(self, window, buckets):
+        self.recent = deque(maxlen=window)
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.totals = dict.fromkeys(self.TOTALS, 0)
+
+    def add(self, sample):
+        self.recent.append(sample)
+        self.count += 1
+        for name in self.TOTALS:
+            self.totals[name] += getattr(sample, name)
+        for index, bound in enumerate(self.buckets):
+            if sample.wall_time <= bound:
+                self.bucket_counts[index] += 1
+
+    def summary(self):
+        """Return averages, wall time percentiles and a wall time histogram over the recent requests."""
+
+        recent = list(self.recent)
+        wall_times = sorted(sample.wall_time for sample in recent)
+        summary = {'requests': self.count, 'recent': len(recent)}
+        for name in self.TOTALS:
+            summary[f'mean_{name}'] = sum(getattr(sample, name) for sample in recent) / len(recent)
+        for percentile in (50, 95, 99):
+            summary[f'p{percentile}_wall_time'] = wall_times[max(ceil(len(wall_times) * percentile / 100) - 1, 0)]
+        summary['histogram'] = {
+            str(bound): sum(1 for wall_time in wall_times if wall_time <= bound) for bound in self.buckets
+        }
+        return summary
+
+
+class RequestStats:
+    """Thread-safe registry of the statistics of each URL name."""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.views = {}
+        self.last_dump = monotonic()
+
+    def record(self, view_name, sample):
+        with self.lock:
+            stats = self.views.get(view_name)
+            if stats is None:
+                stats = self.views[view_name] = ViewStats(
+                    settings.INSTRUMENTATION_WINDOW, settings.INSTRUMENTATION_BUCKETS
+                )
+            stats.add(sample)
+
+    def reset(self):
+        with self.lock:
+            self.views = {}
+
+    def summary(self):
+        """Return the summary of each URL name, slowest at the 95th percentile first."""
+
+        with self.lock:
+            summaries = {view_name: stats.summary() for view_name, stats in self.views.items()}
+        return dict(sorted(summaries.items(), key=lambda item: item[1]['p95_wall_time'], reverse=True))
+
+    def prometheus(self):
+        """Return the running totals in the Prometheus text exposition format."""
+
+        lines = [
+            '# HELP task_manager_request_seconds Wall time of requests by URL name.',
+            '# TYPE task_manager_request_seconds histogram',
+        ]
+        with self.lock:
+            views = sorted(self.views.items())
+            for view_name, stats in views:
+                label = f'view="{view_name}"'
+                for bound, count in zip(stats.buckets, stats.bucket_counts):
+                    lines.append(f'task_manager_request_seconds_bucket{{{label},le="{bound}"}} {count}')
+                lines.append(f'task_manager_request_seconds_bucket{{{label},le="+Inf"}} {stats.count}')
+                lines.append(f'task_manager_request_seconds_sum{{{label}}} {stats.totals["wall_time"]:.6f}')
+                lines.append(f'task_manager_request_seconds_count{{{label}}} {stats.count}')
+            for total, metric, description in (
+                ('db_time', 'task_manager_request_db_seconds_total', 'Time spent running queries'),
+                ('template_time', 'task_manager_request_template_seconds_total', 'Time spent rendering templates'),
+                ('python_time', 'task_manager_request_python_seconds_total', 'Time spent in Python code'),
+                ('queries', 'task_manager_request_queries_total', 'Queries run'),
+                ('response_size', 'task_manager_response_bytes_total', 'Bytes of response content'),
+            ):
+                lines.append(f'# HELP {metric} {description} by URL name.')
+                lines.append(f'# TYPE {metric} counter')
+                for view_name, stats in views:
+                    lines.append(f'{metric}{{view="{view_name}"}} {stats.totals[total]:g}')
+        return '\n'.join(lines) + '\n'
+
+    def dump_if_due(self):
+        """Write the running totals to ``settings.INSTRUMENTATION_DUMP_PATH`` once the dump interval has passed."""
+
+        path = settings.INSTRUMENTATION_DUMP_PATH
+        if not path:
+            return
+        with self.lock:
+            if monotonic() - self.last_dump < settings.INSTRUMENTATION_DUMP_INTERVAL:
+                return
+            self.last_dump = monotonic()
+        # Write a temporary file and rename it, so that readers never see a partly written dump.
+        directory = os.path.dirname(os.path.abspath(path))
+        with tempfile.NamedTemporaryFile('w', dir=directory, delete=False) as dump:
+            dump.write(self.prometheus())
+        os.replace(dump.name, path)
+
+
+request_stats = RequestStats()
+
+
+class InstrumentedTemplate:
+    """Template that adds the time it takes to render, less any queries run meanwhile, to the current request."""
+
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        timings = current_timings()
+        if timings is None:
+            return self.template.render(context, request)
+        start = perf_counter()
+        db_time = timings.db_time
+        try:
+            return self.template.render(context, request)
+        finally:
+            timings.template_time += perf_counter() - start - (timings.db_time - db_time)
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """Django template backend whose templates report their render time to the request instrumentation."""
+
+    def from_string(self, template_code):
+        return InstrumentedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return InstrumentedTemplate(super().get_template(template_name))
@@ -0,0 +1,102 @@
+"""Team leaderboards kept up to date incrementally as tasks and memberships change."""
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce
+from .models import Task, Team, TeamMemberScore
+
+
+def credit_members(team_id, user_ids, points, completed=1):
+    """Add a completed task's points to the scores the given users hold in a team.
+
+    Pass negative points and completed counts to take a task back off their scores.
+    """
+
+    if not user_ids:
+        return
+    TeamMemberScore.objects.filter(team_id=team_id, user_id__in=user_ids).update(
+        points=F('points') + points,
+        completed_count=F('completed_count') + completed,
+    )
+
+def completed_totals(team_id, user_ids):
+    """Return a dictionary of user id to the points and number of the team's tasks they completed."""
+
+    totals = (
+        Task.objects
+        .filter(author_id=team_id, is_complete=True, assigned_members__in=user_ids)
+        .values_list('assigned_members')
+        .annotate(total=Sum('points'), count=Count('pk'))
+        .order_by()
+    )
+    return {user_id: (points, count) for user_id, points, count in totals}
+
+def recalculate_scores(team_id, user_ids):
+    """Recompute from scratch the scores the given team members hold in a team."""
+
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+    totals = completed_totals(team_id, user_ids)
+    scores = []
+    for user_id in user_ids:
+        points, completed_count = totals.get(user_id, (0, 0))
+        scores.append(TeamMemberScore(team_id=team_id, user_id=user_id, points=points, completed_count=completed_count))
+    TeamMemberScore.objects.bulk_create(
+        scores,
+        update_conflicts=True,
+        unique_fields=['team', 'user'],
+        update_fields=['points', 'completed_count'],
+    )
+
+def rebuild_scores(team_ids=None):
+    """Recompute every member's score in the given teams, or in all teams when none are given."""
+
+    teams = Team.objects.all()
+    if team_ids is not None:
+        teams = teams.filter(pk__in=team_ids)
+    for team in teams:
+        members = list(aggregate_leaderboard(team))
+        TeamMemberScore.objects.filter(team=team).exclude(user__in=members).delete()
+        scores = [
+            TeamMemberScore(team=team, user=member, points=member.points, completed_count=member.completed_count)
+            for member in members
+        ]
+        TeamMemberScore.objects.bulk_create(
+            scores,
+            update_conflicts=True,
+            unique_fields=['team', 'user'],
+            update_fields=['points', 'completed_count'],
+        )
+
+def remove_scores(team_id, user_ids=None):
+    """Drop the scores of users who are no longer members of a team."""
+
+    scores = TeamMemberScore.objects.filter(team_id=team_id)
+    if user_ids is not None:
+        scores = scores.filter(user_id__in=user_ids)
+    scores.delete()
+
+def team_leaderboard(team):
+    """Return the scores of a team's members, highest first, with each member loaded alongside."""
+
+    return list(
+        TeamMemberScore.objects
+        .filter(team=team)
+        .select_related('user')
+        .order_by('-points', 'user__last_name', 'user__first_name')
+    )
+
+def aggregate_leaderboard(team):
+    """Return the members of a team ranked by their completed tasks, aggregated in a single query.
+
+    Each member is annotated with the points and the number of the team's tasks they completed.
+    """
+
+    completed = Q(tasks__author=team, tasks__is_complete=True)
+    return (
+        team.members
+        .annotate(
+            points=Coalesce(Sum('tasks__points', filter=completed), 0),
+            completed_count=Count('tasks', filter=completed),
+        )
+        .order_by('-points', 'last_name', 'first_name')
+    )
@@ -0,0 +1,137 @@
+from datetime import timedelta
+from random import Random
+from time import perf_counter
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from tasks.leaderboard import aggregate_leaderboard, rebuild_scores, team_leaderboard
+from tasks.models import User, Team, Task
+
+
+class Command(BaseCommand):
+    """Benchmark the ways of ranking a team's members by their completed tasks."""
+
+    help = 'Compares the legacy, aggregated and stored team leaderboards at several team sizes'
+
+    ASSIGNEES_PER_TASK = 3
+    COMPLETE_PROB = 0.5
+
+    def add_arguments(self, parser):
+        parser.add_argument('--members', type=int, nargs='+', default=[10, 100, 1000])
+        parser.add_argument('--tasks', type=int, nargs='+', default=[100, 10000])
+        parser.add_argument('--repeat', type=int, default=3, help='Timed runs per strategy; the best run is reported')
+        parser.add_argument(
+            '--legacy-limit', type=int, default=100000,
+            help='Skip the legacy per-member loop when members x tasks exceeds this'
+        )
+
+    def handle(self, *args, **options):
+        self.random = Random(0)
+        self.stdout.write(f"{'members':>8} {'tasks':>7} {'strategy':<10} {'best ms':>10} {'queries':>8}")
+        for member_count in options['members']:
+            for task_count in options['tasks']:
+                self.benchmark(member_count, task_count, options)
+
+    def benchmark(self, member_count, task_count, options):
+        """Time each strategy against a freshly built team, rolling the data back afterwards."""
+
+        with transaction.atomic():
+            team = self.build_team(member_count, task_count)
+            strategies = {
+                'aggregate': lambda: list(aggregate_leaderboard(team)),
+                'stored': lambda: team_leaderboard(team),
+            }
+            if member_count * task_count <= options['legacy_limit']:
+                strategies['legacy'] = lambda: legacy_task_complete_score(team)
+
+            for name, strategy in strategies.items():
+                elapsed, queries = self.measure(strategy, options['repeat'])
+                self.stdout.write(f"{member_count:>8} {task_count:>7} {name:<10} {elapsed * 1000:>10.2f} {queries:>8}")
+            transaction.set_rollback(True)
+
+    def measure(self, strategy, repeat):
+        """Return the fastest of several runs of a strategy, and the queries it issued per run."""
+
+        best = None
+        for _ in range(repeat):
+            counter = QueryCounter()
+            with connection.execute_wrapper(counter):
+                start = perf_counter()
+                strategy()
+                elapsed = perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, counter.count
+
+    def build_team(self, member_count, task_count):
+        """Bulk insert a team with its members, tasks and assignments."""
+
+        password = make_password(None)
+        users = User.objects.bulk_create([
+            User(
+                username=f'@benchmark{index}',
+                email=f'benchmark{index}@example.org',
+                first_name='Bench',
+                last_name=f'Mark{index}',
+                password=password,
+            )
+            for index in range(member_count)
+        ])
+        team = Team.objects.create(author=users[0], title='Benchmark Team')
+        Team.members.through.objects.bulk_create(
+            [Team.members.through(team=team, user=user) for user in users]
+        )
+
+        due_date = timezone.now() + timedelta(days=30)
+        tasks = Task.objects.bulk_create(
+            [
+                Task(
+                    author=team,
+                    title=f'Benchmark Task {index}',
+                    description='Benchmark task',
+                    due_date=due_date,
+                    is_complete=self.random.random() < self.COMPLETE_PROB,
+                    points=self.random.randint(1, 5),
+                )
+                for index in range(task_count)
+            ],
+            batch_size=1000,
+        )
+        assignees = min(self.ASSIGNEES_PER_TASK, member_count)
+        Task.assigned_members.through.objects.bulk_create(
+            [
+                Task.assigned_members.through(task=task, user=user)
+                for task in tasks
+                for user in self.random.sample(users, assignees)
+            ],
+            batch_size=1000,
+        )
+        rebuild_scores([team.id])
+        return team
+
+
+class QueryCounter:
+    """Database execute wrapper counting the queries run through it."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def legacy_task_complete_score(team):
+    """The original per-member, per-task leaderboard loop, kept as a benchmark reference."""
+
+    members = team.members.all()
+    tasks = Task.objects.filter(author=team)
+    for member in members:
+        member.total_tasks_completed = 0
+        for task in tasks:
+            if task.is_complete and member in task.assigned_members.all():
+                member.total_tasks_completed += task.points
+                member.save()
+    return sorted(members, key=lambda m: m.total_tasks_completed, reverse=True)
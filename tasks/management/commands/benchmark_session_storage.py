@@ -0,0 +1,128 @@
+from io import StringIO
+from time import perf_counter
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from task_manager.sessions import MESSAGE_STORAGES, SESSION_ENGINES
+from tasks.management.commands.seed import SCALE_PROFILES
+from tasks.models import Team, Task
+
+CONFIGURATIONS = (
+    ('db', 'fallback'),
+    ('db', 'session'),
+    ('cached_db', 'fallback'),
+    ('cache', 'fallback'),
+    ('signed_cookies', 'cookie'),
+)
+
+
+class SessionQueryCounter:
+    """Database execute wrapper counting the queries run through it, and those touching sessions."""
+
+    def __init__(self):
+        self.count = 0
+        self.session_count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        if 'django_session' in sql:
+            self.session_count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    """Compare the queries and latency of task actions under each session and message storage."""
+
+    help = 'Reports the queries per request of toggling and assigning tasks with each session and message storage'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profile', choices=SCALE_PROFILES, default='small', help='Scale profile to seed')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the generated data')
+        parser.add_argument('--requests', type=int, default=20, help='Timed requests per view and storage')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 2 or options['requests'] % 2:
+            raise CommandError(
+                'Pass an even number of requests, so that each storage toggles and assigns as often as it undoes it.'
+            )
+        if isinstance(caches[DEFAULT_CACHE_ALIAS], DummyCache):
+            raise CommandError('The cache-backed session stores need a cache; set CACHE_URL to a real one.')
+
+        results = []
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            # Deliver notifications within the request, so that every storage is measured doing the same work,
+            # leave the query budget middleware's own bookkeeping out of the timings, and keep every read on
+            # the throwaway database rather than on a configured replica.
+            with override_settings(NOTIFICATION_DISPATCH='inline', QUERY_BUDGET_ENABLED=False, REPLICA_DATABASE=None):
+                call_command('seed', bulk=True, profile=options['profile'], seed=options['seed'], stdout=StringIO())
+                task, member = self.pick_task()
+                for session_store, message_store in CONFIGURATIONS:
+                    with override_settings(
+                        SESSION_ENGINE=SESSION_ENGINES[session_store], MESSAGE_STORAGE=MESSAGE_STORAGES[message_store]
+                    ):
+                        client = Client()
+                        client.force_login(task.author.author)
+                        for name, url in (
+                            ('toggle_task_status', reverse('task_toggle', args=[task.pk])),
+                            ('assign_member_to_task', reverse('assign_member_to_task', args=[task.pk, member.pk])),
+                        ):
+                            results.append(
+                                (session_store, message_store, name, self.measure(client, url, options['requests']))
+                            )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(
+            f"{'sessions':<15} {'messages':<9} {'view':<22} {'queries':>8} {'session':>8} {'mean ms':>8}"
+        )
+        for session_store, message_store, name, result in results:
+            self.stdout.write(
+                f"{session_store:<15} {message_store:<9} {name:<22} {result['queries']:>8.1f} "
+                f"{result['session_queries']:>8.1f} {result['mean_ms']:>8.2f}"
+            )
+
+    def pick_task(self):
+        """Return an unarchived task of the first team with a member besides its author, and that member."""
+
+        for team in Team.objects.select_related('author').order_by('pk'):
+            member = team.members.exclude(pk=team.author_id).order_by('pk').first()
+            task = Task.objects.filter(author=team, is_archived=False).select_related('author__author').first()
+            if member is not None and task is not None:
+                return task, member
+        raise CommandError('The seeded data has no team with tasks and members; pick a larger profile.')
+
+    def measure(self, client, url, repeat):
+        """Time an action over several requests after two warm-up ones, reading its message on the next page untimed.
+
+        The actions undo themselves when repeated, so an even number of requests leaves the task as it was.
+        """
+
+        queries = session_queries = elapsed = 0
+        for index in range(repeat + 2):
+            counter = SessionQueryCounter()
+            with connection.execute_wrapper(counter):
+                start = perf_counter()
+                response = client.get(url)
+                duration = perf_counter() - start
+            if response.status_code != 302:
+                raise CommandError(f"{url} responded with {response.status_code} instead of 302.")
+            client.get(response.url)
+            if index >= 2:
+                queries += counter.count
+                session_queries += counter.session_count
+                elapsed += duration
+        return {
+            'queries': queries / repeat,
+            'session_queries': session_queries / repeat,
+            'mean_ms': round(elapsed / repeat * 1000, 2),
+        }
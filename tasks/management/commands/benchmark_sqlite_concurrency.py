@@ -0,0 +1,119 @@
+import os
+import tempfile
+from io import StringIO
+from threading import Barrier, Event, Lock, Thread
+from time import perf_counter, sleep
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from task_manager.database import TUNED_SQLITE_PRAGMAS
+from tasks.management.commands.seed import SCALE_PROFILES
+from tasks.models import Team, Task
+
+
+class Command(BaseCommand):
+    """Compare SQLite's default settings with the tuned pragmas under concurrent reads and writes."""
+
+    help = 'Reports the throughput of threads toggling tasks while others render the team page, with and without SQLite tuning'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profile', choices=SCALE_PROFILES, default='small', help='Scale profile to seed')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the generated data')
+        parser.add_argument('--writers', type=int, default=4, help='Threads toggling tasks')
+        parser.add_argument('--readers', type=int, default=4, help='Threads rendering the team page')
+        parser.add_argument('--duration', type=float, default=10, help='Seconds to run each configuration for')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('This benchmark compares SQLite settings; point DATABASE_URL at SQLite.')
+        if options['writers'] < 1 or options['readers'] < 1:
+            raise CommandError('At least one writer and one reader are needed.')
+
+        results = {}
+        setup_test_environment()
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                for label, pragmas in (('default', {}), ('tuned', TUNED_SQLITE_PRAGMAS)):
+                    # A file rather than the usual in-memory test database, since locking is what is measured.
+                    # Every read stays on it, rather than going to a configured replica.
+                    path = os.path.join(directory, f'{label}.sqlite3')
+                    with override_settings(SQLITE_PRAGMAS=pragmas, NOTIFICATION_DISPATCH='inline', REPLICA_DATABASE=None):
+                        results[label] = self.run_configuration(path, options)
+        finally:
+            teardown_test_environment()
+
+        self.stdout.write(f"{'pragmas':<10} {'writes/s':>10} {'reads/s':>10} {'locked':>8}")
+        for label, result in results.items():
+            self.stdout.write(
+                f"{label:<10} {result['writes'] / result['elapsed']:>10.1f} "
+                f"{result['reads'] / result['elapsed']:>10.1f} {result['locked']:>8}"
+            )
+
+    def run_configuration(self, path, options):
+        """Seed a fresh database file and hammer it from the writer and reader threads."""
+
+        test_settings = connection.settings_dict['TEST']
+        old_test_name = test_settings['NAME']
+        test_settings['NAME'] = path
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            call_command('seed', bulk=True, profile=options['profile'], seed=options['seed'], stdout=StringIO())
+            team = Team.objects.annotate(task_count=Count('task')).order_by('-task_count', 'pk').first()
+            tasks = list(Task.objects.filter(author=team, is_archived=False).values_list('pk', flat=True))
+            if not tasks:
+                raise CommandError('The seeded data has no tasks to toggle; pick a larger profile.')
+            connection.close()
+            return self.hammer(team, tasks, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            test_settings['NAME'] = old_test_name
+
+    def hammer(self, team, tasks, options):
+        """Run the threads for the configured duration and count the requests each kind completed."""
+
+        counts = {'writes': 0, 'reads': 0, 'locked': 0}
+        counts_lock = Lock()
+        stop = Event()
+        thread_count = options['writers'] + options['readers']
+        start = Barrier(thread_count + 1)
+        team_url = reverse('show_team', args=[team.pk])
+
+        def work(kind, index):
+            client = Client()
+            client.force_login(team.author)
+            start.wait()
+            try:
+                while not stop.is_set():
+                    try:
+                        if kind == 'writes':
+                            task_id = tasks[index % len(tasks)]
+                            index += options['writers']
+                            client.get(reverse('task_toggle', args=[task_id]))
+                        else:
+                            client.get(team_url)
+                        outcome = kind
+                    except OperationalError:
+                        outcome = 'locked'
+                    with counts_lock:
+                        counts[outcome] += 1
+            finally:
+                connections.close_all()
+
+        threads = [Thread(target=work, args=('writes', index)) for index in range(options['writers'])]
+        threads += [Thread(target=work, args=('reads', index)) for index in range(options['readers'])]
+        for thread in threads:
+            thread.start()
+        start.wait()
+        began = perf_counter()
+        sleep(options['duration'])
+        stop.set()
+        for thread in threads:
+            thread.join()
+        counts['elapsed'] = perf_counter() - began
+        return counts
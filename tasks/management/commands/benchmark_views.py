@@ -0,0 +1,216 @@
+import json
+import tracemalloc
+from datetime import timedelta
+from io import StringIO
+from statistics import quantiles
+from time import perf_counter
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.management.commands.benchmark_leaderboard import QueryCounter
+from tasks.management.commands.seed import SCALE_PROFILES
+from tasks.models import User, Team, Task, Invitation, Notification
+from tasks.notifications import refresh_unseen_notification_counts
+
+
+class Command(BaseCommand):
+    """Benchmark the main pages end to end, through the test client against a seeded throwaway database."""
+
+    help = 'Reports the latency, query count and peak memory of the main views, optionally against a baseline'
+
+    NOTIFICATION_COUNT = 50
+    PENDING_INVITATION_COUNT = 10
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profile', choices=SCALE_PROFILES, default='small', help='Scale profile to seed')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the generated data')
+        parser.add_argument('--requests', type=int, default=20, help='Timed requests per view')
+        parser.add_argument('--baseline', help='JSON file of earlier results to check for regressions against')
+        parser.add_argument('--save-baseline', help='Write the results to this JSON file')
+        parser.add_argument(
+            '--tolerance', type=float, default=0.5,
+            help='Fraction by which p95 latency and peak memory may exceed the baseline before they count as regressions'
+        )
+
+    def handle(self, *args, **options):
+        if options['requests'] < 2:
+            raise CommandError('At least two requests per view are needed to work out percentiles.')
+        baseline = self.load_baseline(options)
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            # Deliver notifications within the request, so that their cost and queries are counted, and keep
+            # every read on the throwaway database rather than on a configured replica.
+            with override_settings(NOTIFICATION_DISPATCH='inline', REPLICA_DATABASE=None):
+                call_command('seed', bulk=True, profile=options['profile'], seed=options['seed'], stdout=StringIO())
+                results = {
+                    name: self.measure(name, expected_status, request, options['requests'])
+                    for name, expected_status, request in self.scenarios(options['requests'] + 2)
+                }
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(f"{'view':<22} {'p50 ms':>8} {'p95 ms':>8} {'queries':>8} {'peak KiB':>10}")
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<22} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+                f"{result['queries']:>8} {result['peak_kib']:>10.1f}"
+            )
+        if options['save_baseline']:
+            with open(options['save_baseline'], 'w') as baseline_file:
+                json.dump(
+                    {'profile': options['profile'], 'seed': options['seed'], 'views': results},
+                    baseline_file, indent=2,
+                )
+        if baseline is not None:
+            self.check_regressions(results, baseline, options['tolerance'])
+
+    def load_baseline(self, options):
+        """Read the baseline up front, so a bad file is reported before spending time on the benchmark."""
+
+        if not options['baseline']:
+            return None
+        try:
+            with open(options['baseline']) as baseline_file:
+                baseline = json.load(baseline_file)
+        except (OSError, ValueError) as error:
+            raise CommandError(f"Cannot read the baseline: {error}")
+        if (baseline.get('profile'), baseline.get('seed')) != (options['profile'], options['seed']):
+            raise CommandError(
+                f"The baseline was recorded with profile {baseline.get('profile')} and seed {baseline.get('seed')}."
+            )
+        return baseline
+
+    def scenarios(self, calls):
+        """Return the name, expected status and request function of each benchmarked view.
+
+        Everything runs as the author of the largest team that leaves enough users to invite, and each
+        request function takes the index of the call so that views which change data get fresh input.
+        """
+
+        team = (
+            Team.objects
+            .annotate(member_count=Count('members'))
+            .filter(member_count__lte=User.objects.count() - 2 * calls)
+            .order_by('-member_count', 'pk')
+            .first()
+        )
+        if team is None:
+            raise CommandError('The seeded data is too small for this many requests; pick a larger profile.')
+        user = team.author
+        members = list(team.members.exclude(pk=user.pk).order_by('pk')[:calls])
+        tasks = list(Task.objects.filter(author=team, is_archived=False).order_by('pk')[:calls])
+        outsiders = list(
+            User.objects
+            .exclude(teams=team)
+            .exclude(email__in=Invitation.objects.filter(team=team).values('email'))
+            .order_by('pk')[:calls]
+        )
+        if not members or not tasks or len(outsiders) < calls:
+            raise CommandError('The seeded data is too small for this many requests; pick a larger profile.')
+
+        Notification.objects.bulk_create([
+            Notification(user=user, title=f'Benchmark notification {index}', description='Benchmark', actionable=False)
+            for index in range(self.NOTIFICATION_COUNT)
+        ])
+        refresh_unseen_notification_counts([user.pk])
+        Invitation.objects.bulk_create([
+            Invitation(team=other_team, email=user.email, status=Invitation.INVITED)
+            for other_team in (
+                Team.objects
+                .exclude(members=user)
+                .exclude(invitations__email=user.email)
+                .order_by('pk')[:self.PENDING_INVITATION_COUNT]
+            )
+        ])
+
+        client = Client()
+        client.force_login(user)
+        due_date = (timezone.now() + timedelta(days=7)).strftime('%Y-%m-%dT%H:%M')
+        return [
+            ('dashboard', 200, lambda index: client.get(reverse('dashboard'))),
+            ('show_team', 200, lambda index: client.get(reverse('show_team', args=[team.pk]))),
+            ('notifications', 200, lambda index: client.get(reverse('notifications'))),
+            ('list_invitations', 200, lambda index: client.get(reverse('list_invitations'))),
+            (
+                'toggle_task_status', 302,
+                lambda index: client.get(reverse('task_toggle', args=[tasks[index % len(tasks)].pk])),
+            ),
+            (
+                'assign_member_to_task', 302,
+                lambda index: client.get(
+                    reverse('assign_member_to_task', args=[tasks[0].pk, members[index % len(members)].pk])
+                ),
+            ),
+            (
+                'create_task', 302,
+                lambda index: client.post(
+                    reverse('create_task', args=[team.pk]),
+                    {'title': f'Benchmark task {index}', 'description': 'Benchmark task', 'due_date': due_date},
+                ),
+            ),
+            (
+                'invite', 302,
+                lambda index: client.post(reverse('invite', args=[team.pk]), {'email': outsiders[index].email}),
+            ),
+        ]
+
+    def measure(self, name, expected_status, request, repeat):
+        """Time a view over several requests after a warm-up one, then trace the memory of one more."""
+
+        latencies = []
+        queries = 0
+        for index in range(repeat + 1):
+            counter = QueryCounter()
+            with connection.execute_wrapper(counter):
+                start = perf_counter()
+                response = request(index)
+                elapsed = perf_counter() - start
+            if response.status_code != expected_status:
+                raise CommandError(f"{name} responded with {response.status_code} instead of {expected_status}.")
+            if index:
+                latencies.append(elapsed)
+                queries = max(queries, counter.count)
+
+        tracemalloc.start()
+        try:
+            request(repeat + 1)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        percentiles = quantiles(latencies, n=100, method='inclusive')
+        return {
+            'p50_ms': round(percentiles[49] * 1000, 2),
+            'p95_ms': round(percentiles[94] * 1000, 2),
+            'queries': queries,
+            'peak_kib': round(peak / 1024, 1),
+        }
+
+    def check_regressions(self, results, baseline, tolerance):
+        """Fail when a view issues more queries than the baseline, or is much slower or hungrier."""
+
+        regressions = []
+        for name, result in results.items():
+            before = baseline['views'].get(name)
+            if before is None:
+                continue
+            if result['queries'] > before['queries']:
+                regressions.append(f"{name}: {result['queries']} queries, up from {before['queries']}")
+            for metric in ('p95_ms', 'peak_kib'):
+                if result[metric] > before[metric] * (1 + tolerance):
+                    regressions.append(f"{name}: {metric} {result[metric]}, up from {before[metric]}")
+        if regressions:
+            for regression in regressions:
+                self.stderr.write(regression)
+            raise CommandError(f"{len(regressions)} regression(s) against the baseline.")
+        self.stdout.write("No regressions against the baseline.")
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tasks import events
+from tasks.models import Task
+
+
+class Command(BaseCommand):
+    """Notify the people working on tasks that have passed their due date without being completed."""
+
+    help = 'Publishes a task overdue event for each overdue task that has not been notified yet'
+
+    def handle(self, *args, **options):
+        overdue = Task.objects.filter(
+            due_date__lt=timezone.now(), is_complete=False, is_archived=False, overdue_notified=False
+        )
+        task_ids = list(overdue.values_list('pk', flat=True))
+        Task.objects.filter(pk__in=task_ids).update(overdue_notified=True)
+        for task_id in task_ids:
+            events.publish(events.TASK_OVERDUE, task_id=task_id)
+        events.get_dispatcher().join()
+        self.stdout.write(f"Notified {len(task_ids)} overdue tasks.")
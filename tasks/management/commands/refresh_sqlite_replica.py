@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    """Copy the primary SQLite database over the replica, standing in for replication in local setups."""
+
+    help = 'Copies the primary SQLite database over the replica database with SQLite\'s online backup'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--replica', default=settings.REPLICA_DATABASE, help='Alias of the replica database')
+
+    def handle(self, *args, **options):
+        if options['replica'] not in connections:
+            raise CommandError('No replica database is configured; set DATABASE_REPLICA_URL.')
+        primary, replica = connections[DEFAULT_DB_ALIAS], connections[options['replica']]
+        if primary.vendor != 'sqlite' or replica.vendor != 'sqlite':
+            raise CommandError('Only SQLite databases can be copied; real replicas are kept up to date by the database.')
+        primary.ensure_connection()
+        replica.ensure_connection()
+        # The backup API copies a consistent snapshot, even of a database in WAL mode being written to.
+        primary.connection.backup(replica.connection)
+        self.stdout.write(f"Copied {primary.settings_dict['NAME']} to {replica.settings_dict['NAME']}.")
@@ -1,11 +1,27 @@
+from django.contrib.auth.hashers import make_password
 from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
 
-from tasks.models import User, Team, Task, Invitation
+from tasks.models import User, Team, Task, Invitation, TeamMemberScore
 
 
 import pytz
+import re
+from datetime import timedelta
 from faker import Faker
-from random import randint, random
+from itertools import accumulate, islice
+from math import sqrt
+from random import Random
+from time import perf_counter
+
+# Volumes of the named scale profiles, with a target total of each kind of row.
+SCALE_PROFILES = {
+    'small': {'users': 300, 'teams': 300, 'tasks': 600, 'invitations': 100},
+    'medium': {'users': 5000, 'teams': 1000, 'tasks': 20000, 'invitations': 2000},
+    'large': {'users': 50000, 'teams': 10000, 'tasks': 250000, 'invitations': 20000},
+    'xl': {'users': 100000, 'teams': 20000, 'tasks': 1000000, 'invitations': 50000},
+}
 
 user_fixtures = [
     {'username': '@johndoe', 'email': 'john.doe@example.org', 'first_name': 'John', 'last_name': 'Doe'},
@@ -26,12 +42,53 @@ class Command(BaseCommand):
     INVITATION_ACCEPTED_PROB = 0.3
     INVITATION_DECLINED_PROB = 0.2
     DEFAULT_PASSWORD = 'Password123'
+    BULK_BATCH_SIZE = 5000
+    NAME_POOL_SIZE = 1000
+    MIN_TEAM_SIZE = 2
+    TEAM_SIZE_ALPHA = 1.2
     help = 'Seeds the database with sample data'
 
-    def __init__(self):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
         self.faker = Faker('en_GB')
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--bulk', action='store_true',
+            help='Insert rows in batches with bulk_create instead of one at a time, for large volumes'
+        )
+        parser.add_argument('--batch-size', type=int, default=self.BULK_BATCH_SIZE, help='Rows per bulk insert')
+        parser.add_argument(
+            '--profile', choices=SCALE_PROFILES, default='small',
+            help='Named volumes to seed; the explicit counts below override them'
+        )
+        parser.add_argument('--users', type=int, help='Total number of users')
+        parser.add_argument('--teams', type=int, help='Total number of teams')
+        parser.add_argument('--tasks', type=int, help='Total number of tasks')
+        parser.add_argument('--invitations', type=int, help='Number of invitations to send')
+        parser.add_argument(
+            '--seed', type=int,
+            help='Seed the random generators, so that seeding an empty database always produces the same data'
+        )
+
     def handle(self, *args, **options):
+        counts = dict(SCALE_PROFILES[options['profile']])
+        for name in counts:
+            if options[name] is not None:
+                counts[name] = options[name]
+        if min(counts.values()) < 0:
+            raise CommandError('Counts cannot be negative.')
+        self.USER_COUNT = counts['users']
+        self.TEAM_COUNT = counts['teams']
+        self.TASK_COUNT = counts['tasks']
+        self.INVITATION_COUNT = counts['invitations']
+        self.random = Random(options['seed'])
+        if options['seed'] is not None:
+            self.faker.seed_instance(options['seed'])
+
+        if options['bulk']:
+            self.bulk_seed(options['batch_size'])
+            return
         self.create_users()
         self.users = User.objects.all()
         self.seeded_data_for_marker()
@@ -89,16 +146,16 @@ class Command(BaseCommand):
             author=john,
             title='John Does Seeded Team',
             description='In this Team John Doe is the author of the Team so had all functionality required',
-            created_at=self.faker.past_datetime(start_date='-365d', tzinfo=pytz.UTC),
         )
         johnteam.members.add(john, jane, charlie)
         janeteam = Team.objects.create(
             author=jane,
             title='Jane Does Seeded Team',
             description='In this Team Jane Doe is the author of the Team so had all functionality required',
-            created_at=self.faker.past_datetime(start_date='-365d', tzinfo=pytz.UTC),
         )
         janeteam.members.add(jane, john, charlie)
+        self.marker_team_ids = [johnteam.pk, janeteam.pk]
+        self.backdate_teams(self.marker_team_ids)
 
 
     '''Generating Teams - Fills the Database with Random Teams'''
@@ -117,11 +174,10 @@ class Command(BaseCommand):
         author = self.get_random_user()
         title = self.faker.first_name() + "'s Team"
         description = self.faker.text(max_nb_chars=280)
-        created_at = self.faker.past_datetime(start_date='-365d', tzinfo=pytz.UTC)
-        self.try_create_team({'author': author, 'title': title, 'description': description, 'created_at': created_at})
+        self.try_create_team({'author': author, 'title': title, 'description': description})
 
     def get_random_user(self):
-        index = randint(0,self.users.count() -1)
+        index = self.random.randint(0,self.users.count() -1)
         return self.users[index]
 
     def try_create_team(self, data):
@@ -135,9 +191,16 @@ class Command(BaseCommand):
             author=data['author'],
             title=data['title'],
             description=data['description'],
-            created_at=data['created_at'],
         )
         team.members.add(data['author'])
+        self.backdate_teams([team.pk])
+
+    def backdate_teams(self, team_ids):
+        """Give teams a creation date within the past year, which auto_now_add sets to the time of the insert."""
+        Team.objects.bulk_update(
+            [Team(pk=team_id, created_at=self.faker.past_datetime(start_date='-365d', tzinfo=pytz.UTC)) for team_id in team_ids],
+            ['created_at'],
+        )
 
     #Adds Team Members to each randomly created Team
     def add_team_members(self):
@@ -150,7 +213,7 @@ class Command(BaseCommand):
 
     def add_members_for_team(self, team):
         for user in self.users:
-            if random() < self.MEMBER_PROB:
+            if self.random.random() < self.MEMBER_PROB:
                 team.members.add(user)
 
 
@@ -171,14 +234,14 @@ class Command(BaseCommand):
         title = self.faker.first_name() + "'s Task"
         description = self.faker.text(max_nb_chars=280)
         created_at = self.faker.past_datetime(start_date='-365d', tzinfo=pytz.UTC)
-        if random() < self.OVERDUE_PROB:
+        if self.random.random() < self.OVERDUE_PROB:
             due_date = self.faker.past_datetime(start_date='-365d', tzinfo=pytz.UTC)
         else:
             due_date = self.faker.future_datetime(end_date='+30d', tzinfo=pytz.UTC)
         self.try_create_task({'author': author, 'title': title, 'description': description, 'created_at': created_at, 'due_date': due_date})
 
     def get_random_team(self):
-        index = randint(0, Team.objects.count() -1)
+        index = self.random.randint(0, Team.objects.count() -1)
         return Team.objects.all()[index]
 
     def try_create_task(self, data):
@@ -207,7 +270,7 @@ class Command(BaseCommand):
     def assign_members_to_task(self, task):
         for user in self.users:
             tasks_with_user = task.author.members.filter(id=user.id)
-            if tasks_with_user.exists() and random() < self.ASSIGN_PROB:
+            if tasks_with_user.exists() and self.random.random() < self.ASSIGN_PROB:
                 task.assigned_members.add(user)
 
     '''Fill the database with invitations'''
@@ -223,7 +286,7 @@ class Command(BaseCommand):
         team = self.get_random_team()
         user = self.get_random_user()
         if not team.members.filter(id=user.id).exists() and not Invitation.objects.filter(team=team, email=user.email).exists():
-            rnd_value = random()
+            rnd_value = self.random.random()
             if rnd_value < self.INVITATION_ACCEPTED_PROB:
                 status = Invitation.ACCEPTED
             elif rnd_value < self.INVITATION_ACCEPTED_PROB + self.INVITATION_DECLINED_PROB:
@@ -241,8 +304,191 @@ class Command(BaseCommand):
                 print(f"Error creating invitation: {e}")
 
 
+    '''Bulk seeding - the same data, inserted in batches inside a single transaction'''
+    def bulk_seed(self, batch_size):
+        self.batch_size = batch_size
+        self.password = make_password(self.DEFAULT_PASSWORD)
+        self.first_names = [self.faker.first_name() for _ in range(self.NAME_POOL_SIZE)]
+        self.last_names = [self.faker.last_name() for _ in range(self.NAME_POOL_SIZE)]
+        self.descriptions = [self.faker.text(max_nb_chars=280) for _ in range(self.NAME_POOL_SIZE)]
+        with transaction.atomic():
+            self.timed('users', self.bulk_create_users)
+            self.user_ids = list(User.objects.order_by('id').values_list('id', flat=True))
+            self.timed('marker teams', self.seeded_data_for_marker)
+            self.timed('teams', self.bulk_create_teams)
+            self.timed('team members', self.bulk_add_team_members)
+            self.timed('tasks', self.bulk_create_tasks)
+            self.timed('task assignments', self.bulk_assign_to_tasks)
+            self.timed('invitations', self.bulk_create_invitations)
+
+    def timed(self, label, seed_step):
+        start = perf_counter()
+        count = seed_step()
+        message = f"Seeded {label} in {perf_counter() - start:.1f}s"
+        if count is not None:
+            message = f"Seeded {count} {label} in {perf_counter() - start:.1f}s"
+        self.stdout.write(message)
+
+    def bulk_insert(self, model, objects, **kwargs):
+        """Insert objects generated lazily, a batch at a time, and return how many there were."""
+        objects = iter(objects)
+        count = 0
+        while batch := list(islice(objects, self.batch_size)):
+            model.objects.bulk_create(batch, **kwargs)
+            count += len(batch)
+        return count
+
+    def bulk_create_users(self):
+        existing = User.objects.count()
+        users = [User(password=self.password, **data) for data in user_fixtures]
+        for index in range(existing + len(users), self.USER_COUNT):
+            first_name = self.random.choice(self.first_names)
+            last_name = self.random.choice(self.last_names)
+            users.append(User(
+                username=f"{create_username(first_name, last_name)}{index}",
+                email=create_email(first_name, f"{last_name}{index}"),
+                first_name=first_name,
+                last_name=last_name,
+                password=self.password,
+            ))
+        self.bulk_insert(User, users, ignore_conflicts=True)
+        return User.objects.count() - existing
+
+    def bulk_create_teams(self):
+        existing_ids = set(Team.objects.values_list('id', flat=True))
+        teams = (
+            Team(
+                author_id=self.random.choice(self.user_ids),
+                title=self.random.choice(self.first_names) + "'s Team",
+                description=self.random.choice(self.descriptions),
+            )
+            for _ in range(len(existing_ids), self.TEAM_COUNT)
+        )
+        count = self.bulk_insert(Team, teams)
+        # The marker teams get members, tasks and invitations too, like in the legacy path, on top of their own members.
+        marker_ids = set(self.marker_team_ids)
+        self.team_members = {}
+        for team_id, author_id in Team.objects.order_by('id').values_list('id', 'author_id'):
+            if team_id not in existing_ids or team_id in marker_ids:
+                self.team_members[team_id] = [author_id]
+        self.backdate_teams(team_id for team_id in self.team_members if team_id not in marker_ids)
+        self.existing_memberships = set(
+            Team.members.through.objects.filter(team_id__in=marker_ids).values_list('team_id', 'user_id')
+        )
+        for team_id, user_id in sorted(self.existing_memberships):
+            if user_id != self.team_members[team_id][0]:
+                self.team_members[team_id].append(user_id)
+        return count
+
+    def bulk_add_team_members(self):
+        for team_id, members in self.team_members.items():
+            current = set(members)
+            for user_id in self.random.sample(self.user_ids, min(self.random_team_size(), len(self.user_ids))):
+                if user_id not in current:
+                    members.append(user_id)
+        memberships = (
+            (team_id, user_id) for team_id, members in self.team_members.items() for user_id in members
+            if (team_id, user_id) not in self.existing_memberships
+        )
+        count = self.bulk_insert(
+            Team.members.through,
+            (Team.members.through(team_id=team_id, user_id=user_id) for team_id, user_id in memberships),
+        )
+        # Bulk inserts skip the membership signals, so open the new members' scores directly.
+        # Seeded tasks start incomplete, so every score starts at zero.
+        self.bulk_insert(
+            TeamMemberScore,
+            (
+                TeamMemberScore(team_id=team_id, user_id=user_id)
+                for team_id, members in self.team_members.items() for user_id in members
+            ),
+            ignore_conflicts=True,
+        )
+        return count
+
+    def random_team_size(self):
+        """Draw a team size from a Pareto distribution, so most teams are tiny and a few are huge."""
+        return int(self.MIN_TEAM_SIZE * self.random.paretovariate(self.TEAM_SIZE_ALPHA))
+
+    def bulk_create_tasks(self):
+        team_ids = list(self.team_members)
+        if not team_ids:
+            return 0
+        # Bigger teams get proportionally more of the tasks.
+        cum_sizes = list(accumulate(len(members) for members in self.team_members.values()))
+        existing_ids = set(Task.objects.values_list('id', flat=True))
+        now = timezone.now()
+        count = self.bulk_insert(
+            Task,
+            (
+                Task(
+                    author_id=self.random.choices(team_ids, cum_weights=cum_sizes)[0],
+                    title=self.random.choice(self.first_names) + "'s Task",
+                    description=self.random.choice(self.descriptions),
+                    due_date=self.random_due_date(now),
+                )
+                for _ in range(len(existing_ids), self.TASK_COUNT)
+            ),
+        )
+        self.new_tasks = [
+            (task_id, team_id) for task_id, team_id in Task.objects.order_by('id').values_list('id', 'author_id')
+            if task_id not in existing_ids
+        ]
+        return count
+
+    def random_due_date(self, now):
+        if self.random.random() < self.OVERDUE_PROB:
+            return now - timedelta(days=365 * self.random.random())
+        return now + timedelta(days=30 * self.random.random())
+
+    def bulk_assign_to_tasks(self):
+        assignments = (
+            Task.assigned_members.through(task_id=task_id, user_id=user_id)
+            for task_id, team_id in getattr(self, 'new_tasks', [])
+            for user_id in self.random.sample(
+                self.team_members[team_id],
+                binomial(self.random, len(self.team_members[team_id]), self.ASSIGN_PROB),
+            )
+        )
+        return self.bulk_insert(Task.assigned_members.through, assignments)
+
+    def bulk_create_invitations(self):
+        team_ids = list(self.team_members)
+        if not team_ids:
+            return 0
+        emails = dict(User.objects.filter(pk__in=self.user_ids).values_list('id', 'email'))
+        invited = set(Invitation.objects.values_list('team_id', 'email'))
+        members = {team_id: set(user_ids) for team_id, user_ids in self.team_members.items()}
+        invitations = []
+        attempts = 0
+        while len(invitations) < self.INVITATION_COUNT and attempts < self.INVITATION_COUNT * 10:
+            attempts += 1
+            team_id = self.random.choice(team_ids)
+            user_id = self.random.choice(self.user_ids)
+            if user_id in members[team_id] or (team_id, emails[user_id]) in invited:
+                continue
+            invited.add((team_id, emails[user_id]))
+            invitations.append(Invitation(team_id=team_id, email=emails[user_id], status=self.random_invitation_status()))
+        return self.bulk_insert(Invitation, invitations)
+
+    def random_invitation_status(self):
+        rnd_value = self.random.random()
+        if rnd_value < self.INVITATION_ACCEPTED_PROB:
+            return Invitation.ACCEPTED
+        elif rnd_value < self.INVITATION_ACCEPTED_PROB + self.INVITATION_DECLINED_PROB:
+            return Invitation.DECLINED
+        return Invitation.INVITED
+
+
+def binomial(random, n, p):
+    """Draw how many of n independent trials succeed with probability p, approximately when n is large."""
+    if n < 100:
+        return sum(random.random() < p for _ in range(n))
+    mean = n * p
+    return min(max(round(random.gauss(mean, sqrt(mean * (1 - p)))), 0), n)
+
 def create_username(first_name, last_name):
-    return '@' + first_name.lower() + last_name.lower()
+    return '@' + re.sub(r'\W', '', first_name.lower() + last_name.lower())
 
 def create_email(first_name, last_name):
-    return first_name + '.' + last_name + '@example.org'
+    return re.sub(r'[^\w.]', '', first_name + '.' + last_name) + '@example.org'
@@ -0,0 +1,113 @@
+"""Middleware keeping an eye on how much work each request does, and which database it does it on."""
+import logging
+from contextlib import ExitStack
+from time import perf_counter
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from task_manager.routers import request_routing
+from .instrumentation import RequestSample, RequestTimings, request_stats
+from .query_budget import QueryBudgetExceeded, QueryRecorder, budget_violations, query_budget, repeated_queries
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetMiddleware:
+    """Record the queries of each request and check them against the budget of the view that served it.
+
+    Every response gets an ``X-Query-Budget`` header summarising its queries. Breaking a budget raises
+    ``QueryBudgetExceeded`` or logs a warning, depending on ``settings.QUERY_BUDGET_ACTION``.
+    Unless ``settings.QUERY_BUDGET_ENABLED`` is set the middleware removes itself at startup.
+    """
+
+    def __init__(self, get_response):
+        if not settings.QUERY_BUDGET_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        with recorder.record():
+            response = self.get_response(request)
+        match = request.resolver_match
+        if match is None:
+            return response
+
+        queries = recorder.queries
+        budget = query_budget(match.view_name)
+        response['X-Query-Budget'] = (
+            f"queries={len(queries)}; budget={'none' if budget is None else budget}; "
+            f"repeated={len(repeated_queries(queries))}"
+        )
+        violations = budget_violations(match.view_name, queries, budget)
+        if violations:
+            if settings.QUERY_BUDGET_ACTION == 'raise':
+                raise QueryBudgetExceeded('\n'.join(violations))
+            for violation in violations:
+                logger.warning(violation)
+        return response
+
+
+class InstrumentationMiddleware:
+    """Time each request, split into database, template and Python time, and record it by URL name.
+
+    The statistics are kept in ``tasks.instrumentation.request_stats`` and periodically dumped to
+    ``settings.INSTRUMENTATION_DUMP_PATH`` when it is set. Placed first in ``MIDDLEWARE`` so that the
+    wall time covers the other middleware too. Unless ``settings.INSTRUMENTATION_ENABLED`` is set the
+    middleware removes itself at startup.
+    """
+
+    def __init__(self, get_response):
+        if not settings.INSTRUMENTATION_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = perf_counter()
+        with RequestTimings() as timings, ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timings))
+            response = self.get_response(request)
+        wall_time = perf_counter() - start
+
+        match = request.resolver_match
+        if match is not None:
+            response_size = 0 if response.streaming else len(response.content)
+            request_stats.record(
+                match.view_name,
+                RequestSample(wall_time, timings.db_time, timings.template_time, timings.queries, response_size),
+            )
+            request_stats.dump_if_due()
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """Let the database router send the reads of the views in ``settings.REPLICA_VIEWS`` to the replica.
+
+    A request that writes to the primary pins its user to the primary for the following
+    ``settings.REPLICA_PIN_SECONDS`` with a cookie, so that they read their own writes even while
+    the replica lags behind. Placed before the session middleware so that saving the session counts
+    as a write. Unless ``settings.REPLICA_DATABASE`` is set the middleware removes itself at startup.
+    """
+
+    PIN_COOKIE = 'read_primary'
+
+    def __init__(self, get_response):
+        if not settings.REPLICA_DATABASE:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with request_routing() as routing:
+            request.database_routing = routing
+            response = self.get_response(request)
+        if routing.wrote:
+            response.set_cookie(
+                self.PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite='Lax'
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.database_routing.use_replica = (
+            request.resolver_match.url_name in settings.REPLICA_VIEWS and self.PIN_COOKIE not in request.COOKIES
+        )
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.6 on 2026-10-18 07:41
+
+import datetime
+from django.conf import settings
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_team_member_scores(apps, schema_editor):
+    """Give every existing team member a score for the tasks they have already completed."""
+    Team = apps.get_model('tasks', 'Team')
+    Task = apps.get_model('tasks', 'Task')
+    TeamMemberScore = apps.get_model('tasks', 'TeamMemberScore')
+
+    totals = {}
+    completed = Task.objects.filter(is_complete=True).values_list('author_id', 'assigned_members', 'points')
+    for team_id, user_id, points in completed:
+        if user_id is not None:
+            totals[(team_id, user_id)] = totals.get((team_id, user_id), 0) + points
+
+    memberships = Team.members.through.objects.values_list('team_id', 'user_id')
+    TeamMemberScore.objects.bulk_create(
+        [
+            TeamMemberScore(team_id=team_id, user_id=user_id, points=totals.get((team_id, user_id), 0))
+            for team_id, user_id in memberships
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0027_alter_task_due_date'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='task',
+            name='due_date',
+            field=models.DateTimeField(validators=[django.core.validators.MinValueValidator(limit_value=datetime.datetime(2026, 10, 18, 7, 41, 12, 745581, tzinfo=datetime.timezone.utc))]),
+        ),
+        migrations.CreateModel(
+            name='TeamMemberScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('points', models.IntegerField(default=0)),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scores', to='tasks.team')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='team_scores', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='teammemberscore',
+            constraint=models.UniqueConstraint(fields=('team', 'user'), name='unique_team_member_score'),
+        ),
+        migrations.RunPython(populate_team_member_scores, migrations.RunPython.noop),
+    ]
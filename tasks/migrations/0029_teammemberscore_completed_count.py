@@ -0,0 +1,63 @@
+# Generated by Django 4.2.6 on 2026-10-18 07:43
+
+import datetime
+import django.core.validators
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_team_member_scores(apps, schema_editor):
+    """Recount every member's points and completed tasks per team from the assigned tasks."""
+    Team = apps.get_model('tasks', 'Team')
+    Task = apps.get_model('tasks', 'Task')
+    TeamMemberScore = apps.get_model('tasks', 'TeamMemberScore')
+
+    totals = (
+        Task.objects
+        .filter(is_complete=True, assigned_members__isnull=False)
+        .values_list('author_id', 'assigned_members')
+        .annotate(points=Sum('points'), completed_count=Count('pk'))
+        .order_by()
+    )
+    totals = {(team_id, user_id): (points, count) for team_id, user_id, points, count in totals}
+
+    scores = []
+    for team_id, user_id in Team.members.through.objects.values_list('team_id', 'user_id'):
+        points, completed_count = totals.get((team_id, user_id), (0, 0))
+        scores.append(TeamMemberScore(team_id=team_id, user_id=user_id, points=points, completed_count=completed_count))
+    TeamMemberScore.objects.bulk_create(
+        scores,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['team', 'user'],
+        update_fields=['points', 'completed_count'],
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0028_teammemberscore'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='user',
+            name='total_tasks_completed',
+        ),
+        migrations.AddField(
+            model_name='teammemberscore',
+            name='completed_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='due_date',
+            field=models.DateTimeField(validators=[django.core.validators.MinValueValidator(limit_value=datetime.datetime(2026, 10, 18, 7, 43, 2, 467194, tzinfo=datetime.timezone.utc))]),
+        ),
+        migrations.AddIndex(
+            model_name='teammemberscore',
+            index=models.Index(fields=['team', '-points'], name='team_member_score_rank_idx'),
+        ),
+        migrations.RunPython(backfill_team_member_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.6 on 2026-10-18 07:56
+
+import datetime
+import django.core.validators
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_unseen_notifications(apps, schema_editor):
+    """Fill in every user's unseen notification counter from their existing notifications."""
+    User = apps.get_model('tasks', 'User')
+    Notification = apps.get_model('tasks', 'Notification')
+    unseen = (
+        Notification.objects
+        .filter(user=OuterRef('pk'), seen=False)
+        .order_by()
+        .values('user')
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    User.objects.update(unseen_notification_count=Coalesce(Subquery(unseen), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0029_teammemberscore_completed_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='unseen_notification_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='due_date',
+            field=models.DateTimeField(validators=[django.core.validators.MinValueValidator(limit_value=datetime.datetime(2026, 10, 18, 7, 56, 49, 564086, tzinfo=datetime.timezone.utc))]),
+        ),
+        migrations.RunPython(count_unseen_notifications, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.6 on 2026-10-18 08:07
+
+import datetime
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0030_user_unseen_notification_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='overdue_notified',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='due_date',
+            field=models.DateTimeField(validators=[django.core.validators.MinValueValidator(limit_value=datetime.datetime(2026, 10, 18, 8, 7, 52, 857402, tzinfo=datetime.timezone.utc))]),
+        ),
+    ]
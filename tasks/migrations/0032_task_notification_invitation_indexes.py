@@ -0,0 +1,60 @@
+# Generated by Django 4.2.6 on 2026-10-18 08:27
+
+import datetime
+import django.core.validators
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def remove_duplicate_invitations(apps, schema_editor):
+    """Keep only the latest invitation of an email address to each team, ahead of making them unique."""
+    Invitation = apps.get_model('tasks', 'Invitation')
+    duplicates = (
+        Invitation.objects
+        .values('team', 'email')
+        .order_by()
+        .annotate(latest=Max('pk'), count=Count('pk'))
+        .filter(count__gt=1)
+    )
+    for duplicate in duplicates:
+        Invitation.objects.filter(team=duplicate['team'], email=duplicate['email'], pk__lt=duplicate['latest']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0031_task_overdue_notified_alter_task_due_date'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='task',
+            name='due_date',
+            field=models.DateTimeField(validators=[django.core.validators.MinValueValidator(limit_value=datetime.datetime(2026, 10, 18, 8, 27, 53, 838167, tzinfo=datetime.timezone.utc))]),
+        ),
+        migrations.AddIndex(
+            model_name='invitation',
+            index=models.Index(fields=['email', 'status'], name='invitation_email_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', '-created_at'], name='notification_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('seen', False)), fields=['user', '-created_at'], name='notification_user_unseen_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['author', 'due_date'], name='task_team_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_archived', True)), fields=['author', 'due_date'], name='task_team_archived_due_idx'),
+        ),
+        migrations.RunPython(remove_duplicate_invitations, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='invitation',
+            constraint=models.UniqueConstraint(fields=('team', 'email'), name='unique_team_invitation'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.6 on 2026-10-18 09:40
+
+import datetime
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0033_team_cache_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='cache_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='due_date',
+            field=models.DateTimeField(validators=[django.core.validators.MinValueValidator(limit_value=datetime.datetime(2026, 10, 18, 9, 40, 26, 224052, tzinfo=datetime.timezone.utc))]),
+        ),
+    ]
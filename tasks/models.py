@@ -1,9 +1,19 @@
 from django.core.validators import RegexValidator, MinValueValidator
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from functools import lru_cache
 from libgravatar import Gravatar
 from django.utils import timezone
 
+@lru_cache(maxsize=4096)
+def gravatar_url(email, size):
+    """Return the URL of the gravatar for an email address, memoised per (email, size).
+
+    Keying on the email means a user who changes their email gets a fresh URL straight away.
+    """
+
+    return Gravatar(email).get_image(size=size, default='retro')
+
 class User(AbstractUser):
     """Model used for user authentication, and team members related information."""
 
@@ -18,7 +28,8 @@ class User(AbstractUser):
     first_name = models.CharField(max_length=50, blank=False)
     last_name = models.CharField(max_length=50, blank=False)
     email = models.EmailField(unique=True, blank=False)
-    total_tasks_completed = models.IntegerField(default=0, blank=False)
+    unseen_notification_count = models.IntegerField(default=0, blank=False)
+    cache_version = models.PositiveIntegerField(default=0, editable=False)
 
 
     class Meta:
@@ -34,9 +45,7 @@ class User(AbstractUser):
     def gravatar(self, size=120):
         """Return a URL to the user's gravatar."""
 
-        gravatar_object = Gravatar(self.email)
-        gravatar_url = gravatar_object.get_image(size=size, default='retro')
-        return gravatar_url
+        return gravatar_url(self.email, size)
 
     def mini_gravatar(self):
         """Return a URL to a miniature version of the user's gravatar."""
@@ -51,6 +60,8 @@ class Team(models.Model):
     description = models.CharField(max_length=280, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     members = models.ManyToManyField(User, related_name='teams')
+    # Bumped whenever anything shown on the team's page changes, invalidating its cached fragments.
+    cache_version = models.PositiveIntegerField(default=0, editable=False)
     class Meta:
         """Model options."""
 
@@ -72,6 +83,16 @@ class Invitation(models.Model):
     status = models.CharField(max_length = 20, choices = Choice_status, default = INVITED)
     date_sent = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        """Model options."""
+
+        constraints = [
+            models.UniqueConstraint(fields=['team', 'email'], name='unique_team_invitation'),
+        ]
+        indexes = [
+            models.Index(fields=['email', 'status'], name='invitation_email_status_idx'),
+        ]
+
     def __str__ (self):
         return self.email
 
@@ -89,6 +110,10 @@ class Notification(models.Model):
         """Model options."""
 
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='notification_user_created_idx'),
+            models.Index(fields=['user', '-created_at'], condition=models.Q(seen=False), name='notification_user_unseen_idx'),
+        ]
 
     def mark_as_seen(self):
         self.seen = True
@@ -110,6 +135,7 @@ class Task(models.Model):
     is_complete = models.BooleanField(blank=False, default=False)
     is_archived = models.BooleanField(blank=False, default=False)
     points = models.IntegerField(default=1, blank=False)
+    overdue_notified = models.BooleanField(default=False)
 
     def toggle_task_status(self):
         if self.is_complete:
@@ -139,3 +165,25 @@ class Task(models.Model):
         """Model Options"""
 
         ordering = ['due_date']
+        indexes = [
+            models.Index(fields=['author', 'due_date'], condition=models.Q(is_archived=False), name='task_team_due_idx'),
+            models.Index(fields=['author', 'due_date'], condition=models.Q(is_archived=True), name='task_team_archived_due_idx'),
+        ]
+
+"""Points earned by a team member from the completed tasks of a team"""
+class TeamMemberScore(models.Model):
+
+    team = models.ForeignKey(Team, related_name='scores', on_delete=models.CASCADE)
+    user = models.ForeignKey(User, related_name='team_scores', on_delete=models.CASCADE)
+    points = models.IntegerField(default=0, blank=False)
+    completed_count = models.IntegerField(default=0, blank=False)
+
+    class Meta:
+        """Model options."""
+
+        constraints = [
+            models.UniqueConstraint(fields=['team', 'user'], name='unique_team_member_score'),
+        ]
+        indexes = [
+            models.Index(fields=['team', '-points'], name='team_member_score_rank_idx'),
+        ]
@@ -0,0 +1,61 @@
+"""Bookkeeping shared by everything that creates, reads or removes notifications."""
+from django.db import router
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.text import Truncator
+from .models import Invitation, Notification, User
+
+
+def refresh_unseen_notification_counts(user_ids):
+    """Recount the unseen notifications of the given users into their denormalised counter.
+
+    Also bumps their cache versions, retiring their cached lists of unseen notifications.
+    """
+
+    user_ids = set(user_ids)
+    if not user_ids:
+        return
+    unseen = (
+        Notification.objects
+        .filter(user=OuterRef('pk'), seen=False)
+        .order_by()
+        .values('user')
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    User.objects.filter(pk__in=user_ids).update(
+        unseen_notification_count=Coalesce(Subquery(unseen), 0),
+        cache_version=F('cache_version') + 1,
+    )
+
+def invitation_notification(invitation, user):
+    """Return an unsaved notification inviting a user to join the invitation's team, its title shortened to fit."""
+
+    return Notification(
+        user=user,
+        title=Truncator(f"Invitation to join {invitation.team.title}").chars(Notification._meta.get_field('title').max_length),
+        description="",
+        actionable=True,
+        invitation=invitation,
+    )
+
+def create_missing_invitation_notifications(user):
+    """Create in bulk a notification for each pending invitation of the user that does not have one yet.
+
+    Returns the number of notifications created.
+    """
+
+    # Read from the primary, since a lagging replica would report notifications created moments ago as missing.
+    missing = (
+        Invitation.objects
+        .using(router.db_for_write(Notification))
+        .filter(email=user.email, status=Invitation.INVITED)
+        .exclude(notification__user=user)
+        .select_related('team')
+    )
+    notifications = Notification.objects.bulk_create(
+        [invitation_notification(invitation, user) for invitation in missing]
+    )
+    if notifications:
+        refresh_unseen_notification_counts([user.pk])
+    return len(notifications)
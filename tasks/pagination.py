@@ -0,0 +1,63 @@
+"""Keyset pagination of task lists, ordered by due date and then id.
+
+Each page after the first starts strictly after the last task of the page before, so fetching any
+page costs the same however far into the list it is, and tasks added or removed meanwhile do not
+shift later pages.
+"""
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as Base64Error
+from datetime import datetime
+from django.db.models import Q
+from django.http import Http404
+
+TASK_PAGE_SIZE = 25
+
+
+class KeysetPage:
+    """One page of tasks, iterable like a list, with the cursor of the page after it."""
+
+    def __init__(self, items, next_cursor=None):
+        self.items = items
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+
+def encode_cursor(task):
+    """Return an opaque cursor pointing just after a task."""
+
+    key = f'{task.due_date.isoformat()}|{task.pk}'
+    return urlsafe_b64encode(key.encode()).decode()
+
+def decode_cursor(cursor):
+    """Return the due date and id a cursor points after, raising Http404 for a malformed cursor."""
+
+    try:
+        due_date, pk = urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(due_date), int(pk)
+    except (Base64Error, UnicodeError, ValueError):
+        raise Http404('Invalid page cursor')
+
+def paginate_tasks(tasks, cursor=None, page_size=TASK_PAGE_SIZE):
+    """Return the page of tasks following the cursor, or the first page when there is no cursor."""
+
+    tasks = tasks.order_by('due_date', 'pk')
+    if cursor:
+        due_date, pk = decode_cursor(cursor)
+        tasks = tasks.filter(Q(due_date__gt=due_date) | Q(due_date=due_date, pk__gt=pk))
+    items = list(tasks[:page_size + 1])
+    if len(items) <= page_size:
+        return KeysetPage(items)
+    items = items[:page_size]
+    return KeysetPage(items, encode_cursor(items[-1]))
@@ -0,0 +1,75 @@
+"""Per-request query budgets, and detection of the repeated queries that give away an N+1 pattern.
+
+Queries are compared by their normalised SQL, with literals and parameter lists collapsed, so that
+loading the same row for each of many objects shows up as one query repeated many times.
+"""
+import re
+from collections import Counter
+from contextlib import ExitStack
+from django.conf import settings
+from django.db import connections
+
+TRANSACTION_CONTROL = ('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT', 'BEGIN', 'COMMIT', 'ROLLBACK')
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a request runs more queries than its budget, or repeats a query too often."""
+
+
+class QueryRecorder:
+    """Database execute wrapper recording the SQL of every query run through it."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+    def record(self):
+        """Return a context manager recording the queries run on every database connection."""
+
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(self))
+        return stack
+
+
+def normalize_sql(sql):
+    """Return the shape of a query, with its literals and parameter lists replaced by placeholders."""
+
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _PLACEHOLDER_LIST.sub('(...)', sql.replace('%s', '?'))
+    return _WHITESPACE.sub(' ', sql).strip()
+
+def repeated_queries(queries, threshold=None):
+    """Return the normalised queries run at least ``threshold`` times, with how often each ran."""
+
+    threshold = threshold or settings.QUERY_BUDGET_REPEAT_THRESHOLD
+    shapes = Counter(
+        normalize_sql(sql) for sql in queries
+        if not sql.lstrip().upper().startswith(TRANSACTION_CONTROL)
+    )
+    return {shape: count for shape, count in shapes.items() if count >= threshold}
+
+def query_budget(view_name):
+    """Return the number of queries a view may run per request, or None when it has no budget."""
+
+    return settings.QUERY_BUDGETS.get(view_name, settings.QUERY_BUDGET_DEFAULT)
+
+def budget_violations(view_name, queries, budget=None):
+    """Return a description of each way the queries of a request break its view's budget."""
+
+    budget = query_budget(view_name) if budget is None else budget
+    violations = []
+    if budget is not None and len(queries) > budget:
+        violations.append(f"{view_name} ran {len(queries)} queries, over its budget of {budget}")
+    for shape, count in repeated_queries(queries).items():
+        violations.append(f"{view_name} repeated a query {count} times: {shape}")
+    return violations
@@ -0,0 +1,236 @@
+"""Signal handlers keeping denormalised data in step with the models it is derived from."""
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from . import leaderboard
+from .caching import bump_team_versions
+from .models import Notification, Task, Team, User
+from .notifications import refresh_unseen_notification_counts
+
+
+def _task_score_state(task):
+    """Return the fields of a task that decide how many points it is worth, and to which team."""
+
+    state = task.__dict__
+    return (state.get('author_id'), state.get('is_complete'), state.get('points'))
+
+@receiver(post_init, sender=Task)
+def remember_task_score_state(sender, instance, **kwargs):
+    instance._score_state = _task_score_state(instance)
+
+@receiver(post_save, sender=Task)
+def update_scores_on_task_save(sender, instance, created, raw, **kwargs):
+    """Move a task's points between members' scores when it is completed, reopened or re-pointed."""
+
+    old_state = instance._score_state
+    new_state = _task_score_state(instance)
+    instance._score_state = new_state
+    if raw or created or old_state == new_state:
+        return
+
+    old_team_id, was_complete, old_points = old_state
+    new_team_id, is_complete, new_points = new_state
+    if None in old_state:
+        leaderboard.rebuild_scores([new_team_id])
+        return
+    if not (was_complete or is_complete):
+        return
+
+    assigned_ids = list(instance.assigned_members.values_list('pk', flat=True))
+    if was_complete:
+        leaderboard.credit_members(old_team_id, assigned_ids, -old_points, -1)
+    if is_complete:
+        leaderboard.credit_members(new_team_id, assigned_ids, new_points)
+
+@receiver(pre_delete, sender=Task)
+def update_scores_on_task_delete(sender, instance, origin=None, **kwargs):
+    """Take back the points of a completed task that is being deleted."""
+
+    if not instance.is_complete or isinstance(origin, Team):
+        return
+    assigned_ids = list(instance.assigned_members.values_list('pk', flat=True))
+    leaderboard.credit_members(instance.author_id, assigned_ids, -instance.points, -1)
+
+@receiver(m2m_changed, sender=Task.assigned_members.through)
+def update_scores_on_assignment(sender, instance, action, reverse, pk_set, **kwargs):
+    """Credit or deduct the points of completed tasks as members are assigned and unassigned."""
+
+    if action not in ('post_add', 'pre_remove', 'pre_clear'):
+        return
+    sign = 1 if action == 'post_add' else -1
+
+    if reverse:
+        tasks = Task.objects.filter(is_complete=True)
+        if action == 'pre_clear':
+            tasks = tasks.filter(assigned_members=instance)
+        elif action == 'pre_remove':
+            tasks = tasks.filter(assigned_members=instance, pk__in=pk_set)
+        else:
+            tasks = tasks.filter(pk__in=pk_set)
+        for team_id, points in tasks.values_list('author_id', 'points'):
+            leaderboard.credit_members(team_id, [instance.pk], sign * points, sign)
+        return
+
+    if not instance.is_complete:
+        return
+    if action == 'pre_clear':
+        user_ids = list(instance.assigned_members.values_list('pk', flat=True))
+    elif action == 'pre_remove':
+        user_ids = list(instance.assigned_members.filter(pk__in=pk_set).values_list('pk', flat=True))
+    else:
+        user_ids = pk_set
+    leaderboard.credit_members(instance.author_id, user_ids, sign * instance.points, sign)
+
+@receiver(m2m_changed, sender=Team.members.through)
+def update_scores_on_membership(sender, instance, action, reverse, pk_set, **kwargs):
+    """Open a score for members joining a team and drop it for members leaving."""
+
+    if action == 'post_add':
+        if reverse:
+            for team_id in pk_set:
+                leaderboard.recalculate_scores(team_id, [instance.pk])
+        else:
+            leaderboard.recalculate_scores(instance.pk, pk_set)
+    elif action in ('post_remove', 'post_clear'):
+        if reverse:
+            scores = instance.team_scores.all()
+            if action == 'post_remove':
+                scores = scores.filter(team_id__in=pk_set)
+            scores.delete()
+        else:
+            leaderboard.remove_scores(instance.pk, pk_set)
+
+@receiver(post_init, sender=Notification)
+def remember_notification_seen_state(sender, instance, **kwargs):
+    """Note the user and seen flag of a loaded notification, so that saving it recounts only when one changed."""
+
+    state = instance.__dict__
+    instance._seen_state = (state.get('user_id'), state.get('seen'))
+
+@receiver(post_save, sender=Notification)
+def update_unseen_count_on_notification_save(sender, instance, created, **kwargs):
+    """Recount unseen notifications when one arrives, is seen, or moves to another user."""
+
+    old_user_id, was_seen = instance._seen_state
+    instance._seen_state = (instance.user_id, instance.seen)
+    if created:
+        if not instance.seen:
+            refresh_unseen_notification_counts([instance.user_id])
+    elif (old_user_id, was_seen) != instance._seen_state:
+        refresh_unseen_notification_counts({old_user_id, instance.user_id} - {None})
+
+@receiver(post_delete, sender=Notification)
+def update_unseen_count_on_notification_delete(sender, instance, origin=None, **kwargs):
+    """Recount unseen notifications when an unseen one is deleted, unless its user is going too."""
+
+    if instance.seen or isinstance(origin, User):
+        return
+    refresh_unseen_notification_counts([instance.user_id])
+
+
+@receiver(pre_save, sender=Team)
+def bump_team_version_on_save(sender, instance, raw, **kwargs):
+    """Bump an edited team's cache version in the same UPDATE, so a stale copy of the counter is never written back."""
+
+    if not raw and not instance._state.adding:
+        instance.cache_version = F('cache_version') + 1
+
+@receiver(post_save, sender=Team)
+def forget_team_version_on_save(sender, instance, **kwargs):
+    """Drop the expression saved as the cache version, so it is read back from the database when needed."""
+
+    if hasattr(instance.cache_version, 'resolve_expression'):
+        del instance.cache_version
+
+@receiver(pre_save, sender=User)
+def keep_user_counters_on_save(sender, instance, raw, update_fields, **kwargs):
+    """Save a user's cache version and unseen count as they stand in the database, so stale copies are never written back."""
+
+    if not raw and not instance._state.adding and update_fields is None:
+        instance.cache_version = F('cache_version')
+        instance.unseen_notification_count = F('unseen_notification_count')
+
+@receiver(post_save, sender=User)
+def forget_user_counters_on_save(sender, instance, **kwargs):
+    """Drop the expressions saved as the counters, so they are read back from the database when needed."""
+
+    for field in ('cache_version', 'unseen_notification_count'):
+        if hasattr(getattr(instance, field), 'resolve_expression'):
+            delattr(instance, field)
+
+@receiver(post_init, sender=Task)
+def remember_task_team(sender, instance, **kwargs):
+    """Note the team a loaded task belongs to, so that moving it can invalidate the old team's pages too."""
+
+    instance._cached_team_id = instance.__dict__.get('author_id')
+
+@receiver(post_save, sender=Task)
+def bump_team_version_on_task_save(sender, instance, raw, **kwargs):
+    """Invalidate the cached pages of the team a task belongs to, and of the team it moved from."""
+
+    if raw:
+        return
+    bump_team_versions({instance._cached_team_id, instance.author_id})
+    instance._cached_team_id = instance.author_id
+
+@receiver(post_delete, sender=Task)
+def bump_team_version_on_task_delete(sender, instance, origin=None, **kwargs):
+    """Invalidate the cached pages of a deleted task's team, unless the team is going too."""
+
+    if not isinstance(origin, Team):
+        bump_team_versions([instance.author_id])
+
+@receiver(m2m_changed, sender=Task.assigned_members.through)
+def bump_team_version_on_assignment(sender, instance, action, reverse, pk_set, **kwargs):
+    """Invalidate the cached pages of the teams whose tasks members were assigned to or unassigned from."""
+
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            bump_team_versions([instance.author_id])
+    elif action == 'pre_clear':
+        instance._cleared_team_ids = list(instance.tasks.values_list('author_id', flat=True).distinct())
+    elif action == 'post_clear':
+        bump_team_versions(instance._cleared_team_ids)
+    elif action in ('post_add', 'post_remove'):
+        bump_team_versions(Task.objects.filter(pk__in=pk_set).values('author_id'))
+
+@receiver(m2m_changed, sender=Team.members.through)
+def bump_team_version_on_membership(sender, instance, action, reverse, pk_set, **kwargs):
+    """Invalidate the cached pages of the teams that members joined or left."""
+
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            bump_team_versions([instance.pk])
+    elif action == 'pre_clear':
+        instance._cleared_team_ids = list(instance.teams.values_list('pk', flat=True))
+    elif action == 'post_clear':
+        bump_team_versions(instance._cleared_team_ids)
+    elif action in ('post_add', 'post_remove'):
+        bump_team_versions(pk_set)
+
+def _user_display_state(user):
+    """Return the fields of a user shown on the pages of their teams."""
+
+    state = user.__dict__
+    return tuple(state.get(field) for field in ('username', 'first_name', 'last_name', 'email'))
+
+@receiver(post_init, sender=User)
+def remember_user_display_state(sender, instance, **kwargs):
+    """Note the shown fields of a loaded user, so that saving only invalidates their teams' pages when one changed."""
+
+    instance._display_state = _user_display_state(instance)
+
+@receiver(post_save, sender=User)
+def bump_team_version_on_user_save(sender, instance, created, raw, **kwargs):
+    """Invalidate the cached pages of a user's teams when their name, username or gravatar changes."""
+
+    old_state = instance._display_state
+    instance._display_state = _user_display_state(instance)
+    if not (raw or created) and old_state != instance._display_state:
+        bump_team_versions(instance.teams.values('pk'))
+
+@receiver(pre_delete, sender=User)
+def bump_team_version_on_user_delete(sender, instance, **kwargs):
+    """Invalidate the cached pages of the teams a user is leaving by being deleted."""
+
+    bump_team_versions(instance.teams.values('pk'))
@@ -0,0 +1,11 @@
+// Replace a "load more" link with the next page of rows fetched from its URL.
+document.addEventListener('click', function (event) {
+  const link = event.target.closest('[data-load-more]');
+  if (!link) {
+    return;
+  }
+  event.preventDefault();
+  fetch(link.href, { headers: { 'X-Requested-With': 'XMLHttpRequest' } })
+    .then(function (response) { return response.text(); })
+    .then(function (html) { link.parentElement.outerHTML = html; });
+});
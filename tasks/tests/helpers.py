@@ -1,4 +1,8 @@
+from contextlib import contextmanager
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from tasks.query_budget import budget_violations
 from with_asserts.mixin import AssertHTMLMixin
 
 def reverse_with_next(url_name, next_url):
@@ -34,4 +38,48 @@ class MenuTesterMixin(AssertHTMLMixin):
         """Check that no menu is present."""
         
         for url in self.menu_urls:
-            self.assertNotHTML(response, f'a[href="{url}"]')
\ No newline at end of file
+            self.assertNotHTML(response, f'a[href="{url}"]')
+
+class QueryPlanTesterMixin:
+    """Class to extend tests with tools to check how SQLite plans the queries run by the application."""
+
+    explained_statements = ('SELECT', 'UPDATE', 'DELETE')
+
+    def query_plans(self, function):
+        """Run a function and return each query it executed alongside its query plan."""
+
+        with CaptureQueriesContext(connection) as context:
+            function()
+        plans = []
+        with connection.cursor() as cursor:
+            for query in context.captured_queries:
+                if query['sql'].startswith(self.explained_statements):
+                    cursor.execute(f"EXPLAIN QUERY PLAN {query['sql']}")
+                    plans.append((query['sql'], '\n'.join(row[-1] for row in cursor.fetchall())))
+        return plans
+
+    def assert_query_plan_contains(self, function, text):
+        """Check that the plan of at least one query run by the function contains the given text."""
+
+        plans = self.query_plans(function)
+        if not any(text in plan for sql, plan in plans):
+            details = '\n\n'.join(f'{sql}\n{plan}' for sql, plan in plans)
+            self.fail(f'No query plan contains {text!r}:\n\n{details}')
+
+    def assert_uses_index(self, function, index_name):
+        """Check that at least one query run by the function searches the named index."""
+
+        self.assert_query_plan_contains(function, f'INDEX {index_name} ')
+
+class QueryBudgetTesterMixin:
+    """Class to extend tests with checks that code stays within a query budget."""
+
+    @contextmanager
+    def assert_within_query_budget(self, view_name, budget=None):
+        """Check that the queries run in the block fit the view's budget, or the given one, and repeat no query shape."""
+
+        with CaptureQueriesContext(connection) as context:
+            yield
+        violations = budget_violations(view_name, [query['sql'] for query in context.captured_queries], budget)
+        if violations:
+            self.fail('\n'.join(violations))
@@ -1,4 +1,5 @@
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError
 from django.test import TestCase
 from django.utils import timezone
 from tasks.models import Invitation, Team, User
@@ -34,3 +35,10 @@ class InvitationModelTestCase(TestCase):
 
 
 
+
+    def test_email_cannot_be_invited_to_the_same_team_twice(self):
+        duplicate = Invitation(team=self.team, email='test@example.org', status=Invitation.DECLINED)
+        with self.assertRaises(ValidationError):
+            duplicate.full_clean()
+        with self.assertRaises(IntegrityError):
+            duplicate.save()
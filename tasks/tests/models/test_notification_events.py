@@ -0,0 +1,136 @@
+"""Tests of the domain events fanned out to their recipients as notifications."""
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase, override_settings
+from tasks import events
+from tasks.models import User, Team, Task, Invitation, Notification
+
+class NotificationEventsTestCase(TestCase):
+    """Tests of the domain events fanned out to their recipients as notifications."""
+
+    fixtures = [
+        'tasks/tests/fixtures/default_user.json',
+        'tasks/tests/fixtures/other_users.json',
+        'tasks/tests/fixtures/default_team.json',
+        'tasks/tests/fixtures/other_teams.json',
+        'tasks/tests/fixtures/default_task.json',
+        'tasks/tests/fixtures/other_tasks.json'
+    ]
+
+    def setUp(self):
+        super(TestCase, self).setUp()
+        self.user = User.objects.get(username='@johndoe')
+        self.teammate_1 = User.objects.get(username='@janedoe')
+        self.teammate_2 = User.objects.get(username='@petrapickles')
+        self.team = Team.objects.get(pk=1)
+        self.team.members.add(self.user, self.teammate_1, self.teammate_2)
+        self.task = Task.objects.get(pk=1)
+        self.task.assigned_members.add(self.teammate_1, self.teammate_2)
+
+    def _titles(self, user):
+        return list(Notification.objects.filter(user=user).values_list('title', flat=True))
+
+    def test_task_completed_notifies_assignees_and_team_author_but_not_the_actor(self):
+        self.task.toggle_task_status()
+        self.task.save()
+        events.deliver(events.NotificationEvent(events.TASK_COMPLETED, task_id=self.task.pk, actor_id=self.teammate_1.pk))
+        self.assertEqual(self._titles(self.user), [f"Task completed: {self.task.title}"])
+        self.assertEqual(self._titles(self.teammate_2), [f"Task completed: {self.task.title}"])
+        self.assertEqual(self._titles(self.teammate_1), [])
+
+    def test_task_completed_is_dropped_when_the_task_was_reopened(self):
+        created = events.deliver(events.NotificationEvent(events.TASK_COMPLETED, task_id=self.task.pk))
+        self.assertEqual(created, 0)
+
+    def test_delivery_updates_unseen_counters(self):
+        events.deliver(events.NotificationEvent(events.TASK_OVERDUE, task_id=self.task.pk))
+        for user in (self.user, self.teammate_1, self.teammate_2):
+            user.refresh_from_db()
+            self.assertEqual(user.unseen_notification_count, Notification.objects.filter(user=user, seen=False).count())
+            self.assertEqual(self._titles(user), [f"Task overdue: {self.task.title}"])
+
+    def test_long_titles_are_shortened_to_fit(self):
+        self.task.title = 'x' * 50
+        self.task.save()
+        events.deliver(events.NotificationEvent(events.TASK_ASSIGNED, task_id=self.task.pk, user_ids=[self.teammate_1.pk]))
+        title = self._titles(self.teammate_1)[0]
+        self.assertEqual(len(title), Notification._meta.get_field('title').max_length)
+        self.assertTrue(title.startswith("Task assigned: "))
+
+    @override_settings(NOTIFICATION_BATCH_SIZE=50)
+    def test_fan_out_inserts_in_batches_regardless_of_team_size(self):
+        password = make_password(None)
+        users = User.objects.bulk_create([
+            User(username=f'@member{index}', email=f'member{index}@example.org', first_name='Member',
+                 last_name=f'{index}', password=password)
+            for index in range(200)
+        ])
+        Task.assigned_members.through.objects.bulk_create(
+            [Task.assigned_members.through(task=self.task, user=user) for user in users]
+        )
+        Task.objects.filter(pk=self.task.pk).update(is_complete=True)
+        # Task lookup and recipients, then per batch of 50 an insert and a counter update inside a savepoint.
+        with self.assertNumQueries(2 + 5 * 4):
+            created = events.deliver(events.NotificationEvent(events.TASK_COMPLETED, task_id=self.task.pk, actor_id=self.user.pk))
+        self.assertEqual(created, 202)
+
+    def test_invitation_sent_is_not_duplicated(self):
+        invitation = Invitation.objects.create(team=Team.objects.get(pk=5), email=self.user.email, status=Invitation.INVITED)
+        events.publish(events.INVITATION_SENT, invitation_id=invitation.pk, user_id=self.user.pk)
+        events.publish(events.INVITATION_SENT, invitation_id=invitation.pk, user_id=self.user.pk)
+        self.assertEqual(Notification.objects.filter(user=self.user, invitation=invitation).count(), 1)
+
+    def test_long_invitation_titles_are_shortened_to_fit(self):
+        team = Team.objects.get(pk=5)
+        team.title = 'x' * 50
+        team.save()
+        invitation = Invitation.objects.create(team=team, email=self.user.email, status=Invitation.INVITED)
+        events.publish(events.INVITATION_SENT, invitation_id=invitation.pk, user_id=self.user.pk)
+        title = self._titles(self.user)[0]
+        self.assertEqual(len(title), Notification._meta.get_field('title').max_length)
+        self.assertTrue(title.startswith("Invitation to join "))
+
+    def test_invitation_accepted_notifies_the_member_and_the_team_author(self):
+        invitation = Invitation.objects.create(team=self.team, email=self.teammate_1.email, status=Invitation.ACCEPTED)
+        events.publish(events.INVITATION_ACCEPTED, invitation_id=invitation.pk, user_id=self.teammate_1.pk)
+        self.assertEqual(self._titles(self.teammate_1), ["Joined a team"])
+        self.assertEqual(self._titles(self.user), ["New team member"])
+
+    def test_invitation_declined_notifies_the_team_author(self):
+        invitation = Invitation.objects.create(team=self.team, email=self.teammate_1.email, status=Invitation.DECLINED)
+        events.publish(events.INVITATION_DECLINED, invitation_id=invitation.pk, user_id=self.teammate_1.pk)
+        self.assertEqual(self._titles(self.user), ["Invitation declined"])
+        self.assertEqual(self._titles(self.teammate_1), [])
+
+    def test_worker_delivers_queued_events_off_the_calling_thread(self):
+        delivered = []
+        worker = events.NotificationWorker(handle=delivered.append)
+        event = events.NotificationEvent(events.TEAM_CREATED, team_id=self.team.pk, user_id=self.user.pk)
+        worker.enqueue(event)
+        worker.join()
+        self.assertEqual(delivered, [event])
+
+    def test_worker_waits_for_the_publishing_transaction_to_commit(self):
+        delivered = []
+        worker = events.NotificationWorker(handle=delivered.append)
+        event = events.NotificationEvent(events.TEAM_CREATED, team_id=self.team.pk, user_id=self.user.pk)
+        with self.captureOnCommitCallbacks() as callbacks:
+            worker.submit(event)
+        self.assertEqual(delivered, [])
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        worker.join()
+        self.assertEqual(delivered, [event])
+
+    def test_worker_keeps_running_after_a_failed_delivery(self):
+        delivered = []
+        def handle(event):
+            if event.kind == events.TASK_OVERDUE:
+                raise ValueError(event)
+            delivered.append(event)
+        worker = events.NotificationWorker(handle=handle)
+        event = events.NotificationEvent(events.TEAM_CREATED, team_id=self.team.pk, user_id=self.user.pk)
+        with self.assertLogs('tasks.events', level='ERROR'):
+            worker.enqueue(events.NotificationEvent(events.TASK_OVERDUE, task_id=self.task.pk))
+            worker.enqueue(event)
+            worker.join()
+        self.assertEqual(delivered, [event])
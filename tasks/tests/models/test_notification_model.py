@@ -62,3 +62,42 @@ class NotificationTest(TestCase):
         self.assertFalse(self.notification.seen)
         self.notification.mark_as_seen()
         self.assertTrue(self.notification.seen)
+
+    def test_new_unseen_notification_counts_as_unseen(self):
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.unseen_notification_count, 1)
+
+    def test_new_seen_notification_does_not_count_as_unseen(self):
+        Notification.objects.create(title='Seen', user=self.user, actionable=False, seen=True)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.unseen_notification_count, 1)
+
+    def test_marking_notification_as_seen_updates_unseen_count(self):
+        self.notification.mark_as_seen()
+        self.notification.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.unseen_notification_count, 0)
+
+    def test_deleting_unseen_notification_updates_unseen_count(self):
+        self.notification.delete()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.unseen_notification_count, 0)
+
+    def test_moving_notification_to_another_user_updates_both_counts(self):
+        other_user = User.objects.get(username='@janedoe')
+        self.notification.user = other_user
+        self.notification.save()
+        self.user.refresh_from_db()
+        other_user.refresh_from_db()
+        self.assertEqual(self.user.unseen_notification_count, 0)
+        self.assertEqual(other_user.unseen_notification_count, 1)
+
+    def test_saving_a_stale_user_keeps_the_unseen_count(self):
+        stale_user = User.objects.get(pk=self.user.pk)
+        Notification.objects.create(title='Later', user=self.user, actionable=False, seen=False)
+        stale_user.first_name = 'Johnny'
+        stale_user.save()
+        self.assertEqual(stale_user.unseen_notification_count, 2)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.unseen_notification_count, 2)
+        self.assertEqual(self.user.first_name, 'Johnny')
@@ -0,0 +1,66 @@
+"""Tests that the hot task, notification and invitation queries are answered from an index."""
+from unittest import skipUnless
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from tasks.forms import TeamInviteForm
+from tasks.helpers import team_task_page
+from tasks.models import User, Team, Task, Notification
+from tasks.notifications import create_missing_invitation_notifications, refresh_unseen_notification_counts
+from tasks.pagination import encode_cursor
+from tasks.tests.helpers import QueryPlanTesterMixin
+from tasks.views import unseen_notifications
+
+@skipUnless(connection.vendor == 'sqlite', 'Query plans are checked on SQLite')
+class QueryPlanTestCase(QueryPlanTesterMixin, TestCase):
+    """Tests that the hot task, notification and invitation queries are answered from an index."""
+
+    fixtures = [
+        'tasks/tests/fixtures/default_user.json',
+        'tasks/tests/fixtures/other_users.json',
+        'tasks/tests/fixtures/default_team.json',
+        'tasks/tests/fixtures/other_teams.json',
+        'tasks/tests/fixtures/default_task.json',
+        'tasks/tests/fixtures/other_tasks.json'
+    ]
+
+    def setUp(self):
+        super(TestCase, self).setUp()
+        self.user = User.objects.get(username='@johndoe')
+        self.other_user = User.objects.get(username='@janedoe')
+        self.team = Team.objects.get(pk=1)
+        self.team.members.add(self.user)
+
+    def test_team_tasks_are_read_in_due_date_order_from_an_index(self):
+        self.assert_query_plan_contains(lambda: team_task_page(self.team), 'task_team_due_idx (author_id=?)')
+
+    def test_later_pages_of_team_tasks_seek_into_the_index(self):
+        cursor = encode_cursor(Task.objects.get(pk=1))
+        self.assert_query_plan_contains(
+            lambda: team_task_page(self.team, cursor=cursor), 'task_team_due_idx (author_id=? AND due_date>?)'
+        )
+
+    def test_archived_team_tasks_use_their_own_index(self):
+        self.assert_uses_index(lambda: team_task_page(self.team, archived=True), 'task_team_archived_due_idx')
+
+    def test_team_task_pages_are_not_sorted_after_reading(self):
+        plans = self.query_plans(lambda: team_task_page(self.team))
+        task_plan = next(plan for sql, plan in plans if 'FROM "tasks_task"' in sql)
+        self.assertNotIn('TEMP B-TREE', task_plan)
+
+    def test_unseen_notifications_use_the_partial_index(self):
+        request = RequestFactory().get('/')
+        request.user = self.user
+        self.assert_uses_index(lambda: list(unseen_notifications(request)['unseen_notifs']), 'notification_user_unseen_idx')
+
+    def test_unseen_notification_counts_use_the_partial_index(self):
+        self.assert_uses_index(lambda: refresh_unseen_notification_counts([self.user.pk]), 'notification_user_unseen_idx')
+
+    def test_all_notifications_of_a_user_use_an_index(self):
+        self.assert_uses_index(lambda: list(Notification.objects.filter(user=self.user)), 'notification_user_created_idx')
+
+    def test_pending_invitations_are_looked_up_by_email_and_status(self):
+        self.assert_uses_index(lambda: create_missing_invitation_notifications(self.user), 'invitation_email_status_idx')
+
+    def test_existing_invitations_are_looked_up_by_team_and_email(self):
+        form = TeamInviteForm({'email': self.other_user.email}, team=self.team)
+        self.assert_query_plan_contains(form.is_valid, 'INDEX sqlite_autoindex_tasks_invitation_1 (team_id=? AND email=?)')
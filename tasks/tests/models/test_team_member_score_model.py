@@ -0,0 +1,170 @@
+"""Tests of the incrementally maintained team member scores."""
+from django.test import TestCase
+from tasks.leaderboard import aggregate_leaderboard, rebuild_scores, team_leaderboard
+from tasks.models import User, Team, Task, TeamMemberScore
+
+class TeamMemberScoreTest(TestCase):
+    """Tests of the incrementally maintained team member scores."""
+
+    fixtures = [
+        'tasks/tests/fixtures/default_user.json',
+        'tasks/tests/fixtures/other_users.json',
+        'tasks/tests/fixtures/default_team.json',
+        'tasks/tests/fixtures/other_teams.json',
+        'tasks/tests/fixtures/default_task.json',
+        'tasks/tests/fixtures/other_tasks.json'
+    ]
+
+    def setUp(self):
+        super(TestCase, self).setUp()
+        self.user = User.objects.get(username='@johndoe')
+        self.teammate_1 = User.objects.get(username='@janedoe')
+        self.team = Team.objects.get(pk=1)
+        self.team.members.add(self.user, self.teammate_1)
+
+        self.task = Task.objects.get(pk=1)
+        self.task.points = 3
+        self.task.save()
+        self.task.assigned_members.add(self.user, self.teammate_1)
+        self.other_task = Task.objects.get(pk=2)
+        self.other_task.assigned_members.add(self.user)
+
+    def _points(self, user, team=None):
+        return TeamMemberScore.objects.get(team=team or self.team, user=user).points
+
+    def test_joining_a_team_opens_a_score(self):
+        self.assertEqual(self._points(self.user), 0)
+        self.assertEqual(self._points(self.teammate_1), 0)
+
+    def test_completing_a_task_credits_assigned_members(self):
+        self._toggle(self.task)
+        self.assertEqual(self._points(self.user), 3)
+        self.assertEqual(self._points(self.teammate_1), 3)
+
+    def test_reopening_a_task_deducts_its_points(self):
+        self._toggle(self.task)
+        self._toggle(self.task)
+        self.assertEqual(self._points(self.user), 0)
+
+    def test_changing_points_of_a_completed_task_updates_scores(self):
+        self._toggle(self.task)
+        self.task.points = 5
+        self.task.save()
+        self.assertEqual(self._points(self.user), 5)
+
+    def test_saving_an_unchanged_task_does_not_credit_twice(self):
+        self._toggle(self.task)
+        self.task.title = 'Renamed'
+        self.task.save()
+        self.assertEqual(self._points(self.user), 3)
+
+    def test_assigning_a_member_to_a_completed_task_credits_them(self):
+        self._toggle(self.other_task)
+        self.other_task.assigned_members.add(self.teammate_1)
+        self.assertEqual(self._points(self.teammate_1), 1)
+
+    def test_unassigning_a_member_from_a_completed_task_deducts_points(self):
+        self._toggle(self.task)
+        self.task.assigned_members.remove(self.teammate_1)
+        self.assertEqual(self._points(self.teammate_1), 0)
+        self.assertEqual(self._points(self.user), 3)
+
+    def test_unassigning_a_member_who_was_not_assigned_changes_nothing(self):
+        self._toggle(self.other_task)
+        self.other_task.assigned_members.remove(self.teammate_1)
+        self.assertEqual(self._points(self.teammate_1), 0)
+
+    def test_clearing_assignments_of_a_completed_task_deducts_points(self):
+        self._toggle(self.task)
+        self.task.assigned_members.clear()
+        self.assertEqual(self._points(self.user), 0)
+        self.assertEqual(self._points(self.teammate_1), 0)
+
+    def test_assigning_tasks_from_the_user_side_credits_them(self):
+        self._toggle(self.other_task)
+        self.teammate_1.tasks.add(self.other_task)
+        self.assertEqual(self._points(self.teammate_1), 1)
+        self.teammate_1.tasks.remove(self.other_task)
+        self.assertEqual(self._points(self.teammate_1), 0)
+
+    def test_deleting_a_completed_task_deducts_its_points(self):
+        self._toggle(self.task)
+        self.task.delete()
+        self.assertEqual(self._points(self.user), 0)
+
+    def test_member_joining_later_is_credited_for_completed_tasks(self):
+        other_user = User.objects.get(username='@petrapickles')
+        self.task.assigned_members.add(other_user)
+        self._toggle(self.task)
+        self.assertFalse(TeamMemberScore.objects.filter(team=self.team, user=other_user).exists())
+        self.team.members.add(other_user)
+        self.assertEqual(self._points(other_user), 3)
+
+    def test_leaving_a_team_drops_the_score(self):
+        self.team.members.remove(self.teammate_1)
+        self.assertFalse(TeamMemberScore.objects.filter(team=self.team, user=self.teammate_1).exists())
+        self.user.teams.remove(self.team)
+        self.assertFalse(TeamMemberScore.objects.filter(team=self.team, user=self.user).exists())
+
+    def test_deleting_a_team_deletes_its_scores(self):
+        self._toggle(self.task)
+        self.team.delete()
+        self.assertFalse(TeamMemberScore.objects.filter(team_id=1).exists())
+
+    def test_rebuild_scores_matches_incremental_scores(self):
+        self._toggle(self.task)
+        self._toggle(self.other_task)
+        TeamMemberScore.objects.update(points=0, completed_count=0)
+        rebuild_scores([self.team.id])
+        self.assertEqual(self._points(self.user), 4)
+        self.assertEqual(TeamMemberScore.objects.get(team=self.team, user=self.user).completed_count, 2)
+        self.assertEqual(self._points(self.teammate_1), 3)
+
+    def test_completing_a_task_counts_it_for_assigned_members(self):
+        self._toggle(self.task)
+        self._toggle(self.other_task)
+        score = TeamMemberScore.objects.get(team=self.team, user=self.user)
+        self.assertEqual(score.completed_count, 2)
+        self._toggle(self.task)
+        score.refresh_from_db()
+        self.assertEqual(score.completed_count, 1)
+
+    def test_changing_points_of_a_completed_task_keeps_its_count(self):
+        self._toggle(self.task)
+        self.task.points = 5
+        self.task.save()
+        self.assertEqual(TeamMemberScore.objects.get(team=self.team, user=self.user).completed_count, 1)
+
+    def test_team_leaderboard_orders_members_by_points(self):
+        self._toggle(self.other_task)
+        scores = team_leaderboard(self.team)
+        self.assertEqual([score.user for score in scores], [self.user, self.teammate_1])
+        self.assertEqual(scores[0].points, 1)
+
+    def test_team_leaderboard_is_a_single_query(self):
+        with self.assertNumQueries(1):
+            team_leaderboard(self.team)
+
+    def test_aggregate_leaderboard_matches_stored_scores(self):
+        self._toggle(self.task)
+        self._toggle(self.other_task)
+        members = list(aggregate_leaderboard(self.team))
+        scores = team_leaderboard(self.team)
+        self.assertEqual(members, [score.user for score in scores])
+        self.assertEqual([member.points for member in members], [score.points for score in scores])
+        self.assertEqual([member.completed_count for member in members], [2, 1])
+
+    def test_aggregate_leaderboard_ignores_tasks_of_other_teams(self):
+        other_team_task = Task.objects.get(pk=5)
+        other_team_task.assigned_members.add(self.user)
+        self._toggle(other_team_task)
+        members = list(aggregate_leaderboard(self.team))
+        self.assertEqual([member.points for member in members], [0, 0])
+
+    def test_aggregate_leaderboard_is_a_single_query(self):
+        with self.assertNumQueries(1):
+            list(aggregate_leaderboard(self.team))
+
+    def _toggle(self, task):
+        task.toggle_task_status()
+        task.save()
@@ -1,7 +1,7 @@
 """Unit tests for the User model."""
 from django.core.exceptions import ValidationError
 from django.test import TestCase
-from tasks.models import User
+from tasks.models import User, gravatar_url
 
 class UserModelTestCase(TestCase):
     """Unit tests for the User model."""
@@ -143,13 +143,17 @@ class UserModelTestCase(TestCase):
         expected_gravatar_url = self._gravatar_url(size=60)
         self.assertEqual(actual_gravatar_url, expected_gravatar_url)
 
-    def test_user_total_tasks_completed_initially_is_zero(self):
-        self.assertEquals(self.user.total_tasks_completed, 0)
-
-    def test_user_total_tasks_completed_cannot_be_blank(self):
-        self.user.total_tasks_completed = None
-        with self.assertRaises(ValidationError):
-            self.user.full_clean()
+    def test_gravatar_is_memoised_per_email_and_size(self):
+        self.user.gravatar()
+        hits = gravatar_url.cache_info().hits
+        other_instance = User.objects.get(username='@johndoe')
+        self.assertEqual(other_instance.gravatar(), self._gravatar_url(size=120))
+        self.assertEqual(gravatar_url.cache_info().hits, hits + 1)
+
+    def test_gravatar_changes_with_email(self):
+        self.user.gravatar()
+        self.user.email = 'johndoe2@example.org'
+        self.assertNotEqual(self.user.gravatar(), self._gravatar_url(size=120))
 
     def _gravatar_url(self, size):
         gravatar_url = f"{UserModelTestCase.GRAVATAR_URL}?size={size}&default=retro"
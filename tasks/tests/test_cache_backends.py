@@ -0,0 +1,104 @@
+""" Tests of the cached data of teams and users, run against each cache backend """
+import tempfile
+from importlib.util import find_spec
+from unittest import skipUnless
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from task_manager.cache import cache_settings
+from tasks.caching import versioned_key
+from tasks.models import Notification, Task, Team, User
+from tasks.notifications import refresh_unseen_notification_counts
+
+
+class CacheBackendTests:
+    """ Tests of the cached data of teams and users, run by a test case for each cache backend """
+
+    fixtures = [
+        'tasks/tests/fixtures/default_user.json',
+        'tasks/tests/fixtures/other_users.json',
+        'tasks/tests/fixtures/default_team.json',
+        'tasks/tests/fixtures/default_task.json'
+    ]
+
+    def setUp(self):
+        super(TestCase, self).setUp()
+        caches_override = self.settings(CACHES={'default': cache_settings({'CACHE_URL': self.cache_url}, settings.BASE_DIR)})
+        caches_override.enable()
+        self.addCleanup(caches_override.disable)
+        cache.clear()
+        self.user = User.objects.get(username="@johndoe")
+        self.team = Team.objects.get(pk=1)
+        self.team.members.add(self.user)
+        self.task = Task.objects.get(pk=1)
+        Notification.objects.create(user=self.user, title="Earlier news", description="", actionable=False)
+        self.client.login(username=self.user.username, password="Password123")
+
+    def test_repeat_view_of_the_team_page_is_served_from_the_cache(self):
+        url = reverse('show_team', kwargs={'team_id': self.team.id})
+        self.client.get(url)
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertContains(response, self.task.title)
+
+    def test_unseen_notifications_are_cached_until_they_change(self):
+        self.assertContains(self.client.get(reverse('dashboard')), "Earlier news")
+        with self.assertNumQueries(5):
+            self.client.get(reverse('dashboard'))
+        Notification.objects.create(user=self.user, title="Latest news", description="", actionable=False)
+        self.assertContains(self.client.get(reverse('dashboard')), "Latest news")
+
+    def test_bumped_version_retires_cached_data(self):
+        key = versioned_key(self.team, 'example')
+        cache.set(key, "cached")
+        self.task.save()
+        self.team.refresh_from_db()
+        self.assertEqual(cache.get(key), "cached")
+        self.assertIsNone(cache.get(versioned_key(self.team, 'example')))
+
+
+class LocMemCacheTestCase(CacheBackendTests, TestCase):
+    """ Tests of the cached data of teams and users in the in-process LRU cache """
+
+    cache_url = 'locmem://?max_entries=100'
+
+
+class FileCacheTestCase(CacheBackendTests, TestCase):
+    """ Tests of the cached data of teams and users in the file cache """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache_url = f'file://{directory.name}'
+        super().setUp()
+
+
+@skipUnless(find_spec('fakeredis'), "fakeredis is not installed")
+class RedisCacheTestCase(CacheBackendTests, TestCase):
+    """ Tests of the cached data of teams and users in Redis, served by an in-process fake """
+
+    cache_url = 'fakeredis://'
+
+
+class UserCacheVersionTestCase(TestCase):
+    """ Tests of the cache version of users """
+
+    fixtures = ['tasks/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        super(TestCase, self).setUp()
+        self.user = User.objects.get(username="@johndoe")
+
+    def test_refreshing_unseen_notifications_bumps_the_version(self):
+        version = self.user.cache_version
+        refresh_unseen_notification_counts([self.user.pk])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.cache_version, version + 1)
+
+    def test_saving_a_stale_user_never_reuses_a_version(self):
+        version = self.user.cache_version
+        refresh_unseen_notification_counts([self.user.pk])
+        self.user.first_name = "Johnny"
+        self.user.save()
+        self.assertEqual(User.objects.get(pk=self.user.pk).cache_version, version + 1)
@@ -0,0 +1,45 @@
+""" Tests of the cache settings read from the environment """
+from pathlib import Path
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+from task_manager.cache import cache_settings, parse_cache_url
+
+
+class CacheSettingsTestCase(SimpleTestCase):
+    """ Tests of the cache settings read from the environment """
+
+    base_dir = Path('/srv/task_manager')
+
+    def test_in_process_cache_is_the_default(self):
+        for environ in ({}, {'CACHE_URL': ''}):
+            config = cache_settings(environ, self.base_dir)
+            self.assertEqual(config['BACKEND'], 'django.core.cache.backends.locmem.LocMemCache')
+            self.assertEqual(config['KEY_PREFIX'], 'task_manager')
+            self.assertEqual(config['VERSION'], 1)
+
+    def test_in_process_cache_size(self):
+        config = parse_cache_url('locmem://?max_entries=5000&cull_frequency=4', self.base_dir)
+        self.assertEqual(config['OPTIONS'], {'MAX_ENTRIES': 5000, 'CULL_FREQUENCY': 4})
+
+    def test_file_cache_paths(self):
+        config = parse_cache_url('file:///var/cache/task_manager', self.base_dir)
+        self.assertEqual(config['BACKEND'], 'django.core.cache.backends.filebased.FileBasedCache')
+        self.assertEqual(config['LOCATION'], '/var/cache/task_manager')
+        self.assertEqual(parse_cache_url('file://cache', self.base_dir)['LOCATION'], str(self.base_dir / 'cache'))
+
+    def test_redis_url_is_passed_on(self):
+        config = parse_cache_url('redis://cache.example.com:6379/2?socket_timeout=1', self.base_dir)
+        self.assertEqual(config['BACKEND'], 'django.core.cache.backends.redis.RedisCache')
+        self.assertEqual(config['LOCATION'], 'redis://cache.example.com:6379/2?socket_timeout=1')
+
+    def test_key_prefix_and_version(self):
+        config = cache_settings({'CACHE_KEY_PREFIX': 'staging', 'CACHE_VERSION': '3'}, self.base_dir)
+        self.assertEqual(config['KEY_PREFIX'], 'staging')
+        self.assertEqual(config['VERSION'], 3)
+
+    def test_invalid_settings_are_rejected(self):
+        for url in ('memcached://localhost:11211', 'locmem://?max_entries=lots', 'locmem://?timeout=5', 'file://'):
+            with self.assertRaises(ImproperlyConfigured):
+                parse_cache_url(url, self.base_dir)
+        with self.assertRaises(ImproperlyConfigured):
+            cache_settings({'CACHE_VERSION': 'latest'}, self.base_dir)
@@ -0,0 +1,52 @@
+""" Tests of the session and message storage read from the environment """
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from task_manager.sessions import MESSAGE_STORAGES, SESSION_ENGINES, message_storage, session_engine
+from tasks.models import Task, Team, User
+
+
+class SessionSettingsTestCase(TestCase):
+    """ Tests of the session and message storage read from the environment """
+
+    fixtures = [
+        'tasks/tests/fixtures/default_user.json',
+        'tasks/tests/fixtures/default_team.json',
+        'tasks/tests/fixtures/default_task.json'
+    ]
+
+    def setUp(self):
+        super(TestCase, self).setUp()
+        self.user = User.objects.get(username="@johndoe")
+        Team.objects.get(pk=1).members.add(self.user)
+        self.toggle_url = reverse('task_toggle', kwargs={'task_id': Task.objects.get(pk=1).id})
+
+    def test_database_sessions_and_cookie_messages_are_the_default(self):
+        self.assertEqual(session_engine({}), 'django.contrib.sessions.backends.db')
+        self.assertEqual(message_storage({'MESSAGE_STORE': ''}), 'django.contrib.messages.storage.fallback.FallbackStorage')
+
+    def test_storage_is_chosen_by_name(self):
+        self.assertEqual(session_engine({'SESSION_STORE': 'cached_db'}), 'django.contrib.sessions.backends.cached_db')
+        self.assertEqual(message_storage({'MESSAGE_STORE': 'session'}), 'django.contrib.messages.storage.session.SessionStorage')
+
+    def test_unknown_storage_is_rejected(self):
+        with self.assertRaises(ImproperlyConfigured):
+            session_engine({'SESSION_STORE': 'memcached'})
+        with self.assertRaises(ImproperlyConfigured):
+            message_storage({'MESSAGE_STORE': 'database'})
+
+    @override_settings(SESSION_ENGINE=SESSION_ENGINES['signed_cookies'], MESSAGE_STORAGE=MESSAGE_STORAGES['cookie'])
+    def test_signed_cookie_sessions_are_never_queried(self):
+        self.client.login(username=self.user.username, password="Password123")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.toggle_url, follow=True)
+        self.assertContains(response, "Task status changed!")
+        self.assertFalse([query for query in queries.captured_queries if 'django_session' in query['sql']])
+
+    @override_settings(MESSAGE_STORAGE=MESSAGE_STORAGES['session'])
+    def test_session_messages_reach_the_next_page(self):
+        self.client.login(username=self.user.username, password="Password123")
+        response = self.client.get(self.toggle_url, follow=True)
+        self.assertContains(response, "Task status changed!")
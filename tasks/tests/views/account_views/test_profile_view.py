@@ -2,6 +2,7 @@
 from django.contrib import messages
 from django.test import TestCase
 from django.urls import reverse
+from django.utils.html import escape
 from tasks.forms import UserForm
 from tasks.models import User
 from tasks.tests.helpers import reverse_with_next
@@ -95,6 +96,14 @@ class ProfileViewTest(TestCase):
         self.assertEqual(self.user.last_name, 'Doe2')
         self.assertEqual(self.user.email, 'johndoe2@example.org')
 
+    def test_profile_update_refreshes_gravatar(self):
+        self.client.login(username=self.user.username, password='Password123')
+        old_gravatar = escape(self.user.mini_gravatar())
+        response = self.client.post(self.url, self.form_input, follow=True)
+        self.assertNotContains(response, old_gravatar)
+        self.user.refresh_from_db()
+        self.assertContains(response, escape(self.user.mini_gravatar()))
+
     def test_post_profile_redirects_when_not_logged_in(self):
         redirect_url = reverse_with_next('log_in', self.url)
         response = self.client.post(self.url, self.form_input)
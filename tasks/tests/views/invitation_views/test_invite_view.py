@@ -2,7 +2,7 @@
 from django.test import TestCase
 from django.urls import reverse
 from django.contrib.messages import get_messages
-from tasks.models import Team, Invitation, User
+from tasks.models import Team, Invitation, Notification, User
 from tasks.forms import TeamInviteForm
 
 class InviteViewTestCase(TestCase):
@@ -51,6 +51,19 @@ class InviteViewTestCase(TestCase):
         self.assertEqual(len(messages_registered), 1)
         self.assertEqual(str(messages_registered[0]), 'Invitation sent successfully.')
 
+    def test_invite_view_post_notifies_invited_user(self):
+        """Inviting a user creates their invitation notification straight away"""
+        self.client.login(username=self.user.username, password='Password123')
+        registered_user = User.objects.get(username='@ericjoker')
+        self.client.post(reverse('invite', args=[self.team.id]), data={'email': registered_user.email})
+        invitation = Invitation.objects.get(email=registered_user.email)
+        notification = Notification.objects.get(user=registered_user)
+        self.assertEqual(notification.invitation, invitation)
+        self.assertEqual(notification.title, f"Invitation to join {self.team.title}")
+        self.assertTrue(notification.actionable)
+        registered_user.refresh_from_db()
+        self.assertEqual(registered_user.unseen_notification_count, 1)
+
     def test_invite_view_post_non_registered_user(self):
         """Only registered users can be invited to the team"""
         self.client.login(username=self.user.username, password='Password123')
@@ -60,12 +60,24 @@ class NotificationsViewTestCase(TestCase):
 
         # invitation object where notification object is not created with it
 
-        other_team_invited = Team.objects.get(pk=5)
+        other_team_invited = Team.objects.get(pk=6)
         invitation_without_notification_object = Invitation.objects.create(team=other_team_invited, email="johndoe@example.org", status=Invitation.INVITED)
 
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 200)
-        self.assertContains(response, f"Invitation to join Team Test5")
+        self.assertContains(response, f"Invitation to join Team Test6")
         notifications = Notification.objects.filter(user=self.user)
         # must equal to two since only self.invitation and the newly created invite is supposed to be seen
         self.assertEqual(len(notifications), 2)
+
+    def test_notifications_page_query_count_does_not_grow_with_invitations(self):
+        self.client.login(username=self.user.username, password = 'Password123')
+        for team in Team.objects.exclude(members=self.user).exclude(invitations__email=self.user.email):
+            Invitation.objects.create(team=team, email=self.user.email, status=Invitation.INVITED)
+        with self.assertNumQueries(7):
+            response = self.client.get(self.url)
+        self.assertContains(response, "Invitation to join Team Test6")
+        with self.assertNumQueries(4):
+            self.client.get(self.url)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.unseen_notification_count, Notification.objects.filter(user=self.user, seen=False).count())
@@ -0,0 +1,49 @@
+"""Tests for the unseen notifications context processor."""
+from django.test import RequestFactory, TestCase
+from django.contrib.auth.models import AnonymousUser
+from django.urls import reverse
+from tasks.models import User
+from tasks.views import unseen_notifications
+
+class UnseenNotificationsContextProcessorTestCase(TestCase):
+    """Tests for the unseen notifications context processor."""
+
+    fixtures = [
+        'tasks/tests/fixtures/default_user.json',
+        'tasks/tests/fixtures/other_users.json',
+        'tasks/tests/fixtures/default_team.json',
+        'tasks/tests/fixtures/other_teams.json',
+        'tasks/tests/fixtures/default_invitations.json',
+        'tasks/tests/fixtures/default_notifications.json'
+    ]
+
+    def setUp(self):
+        self.user = User.objects.get(username="@johndoe")
+
+    def _request(self, user):
+        request = RequestFactory().get('/')
+        request.user = user
+        return request
+
+    def test_unseen_count_is_read_without_querying(self):
+        request = self._request(self.user)
+        with self.assertNumQueries(0):
+            context = unseen_notifications(request)
+            self.assertEqual(context['unseen_notifs_count'], 1)
+
+    def test_unseen_notifications_are_loaded_on_first_use(self):
+        context = unseen_notifications(self._request(self.user))
+        with self.assertNumQueries(1):
+            titles = [notification.title for notification in context['unseen_notifs']]
+            self.assertEqual(titles, ["Noti Test 1"])
+
+    def test_anonymous_user_has_no_unseen_notifications(self):
+        context = unseen_notifications(self._request(AnonymousUser()))
+        self.assertEqual(context['unseen_notifs_count'], 0)
+        self.assertEqual(list(context['unseen_notifs']), [])
+
+    def test_sidebar_shows_unseen_count(self):
+        self.client.login(username=self.user.username, password='Password123')
+        response = self.client.get(reverse('profile'))
+        self.assertEqual(response.context['unseen_notifs_count'], 1)
+        self.assertContains(response, 'Unread Messages')
@@ -72,3 +72,7 @@ class ToggleArchiveStatusTestCase(TestCase):
         self.assertRedirects(response, response_url, status_code=302, target_status_code=200)
         self.assertTemplateUsed(response, 'dashboard.html')
 
+    def test_toggle_archive_query_count(self):
+        self.client.login(username=self.user.username, password="Password123")
+        with self.assertNumQueries(5):
+            self.client.post(self.url)
@@ -1,5 +1,5 @@
 ''' Test case for Assign Member to Task view '''
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from tasks.models import Task, User, Team
 
@@ -70,4 +70,10 @@ class NewTaskTest(TestCase):
             response, response_url,
             status_code=302, target_status_code=200,
             fetch_redirect_response=True
-        )
\ No newline at end of file
+        )
+
+    @override_settings(NOTIFICATION_DISPATCH='thread')
+    def test_assign_member_to_task_query_count(self):
+        self.client.login(username=self.user.username, password="Password123")
+        with self.assertNumQueries(9):
+            self.client.post(self.url)
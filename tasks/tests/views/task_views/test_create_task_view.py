@@ -85,4 +85,11 @@ class NewTaskTest(TestCase):
         response = self.client.post(self.url, self.data, follow=True)
         task_count_after = Task.objects.count()
         self.assertEqual(task_count_after, task_count_before)
-        self.assertTemplateUsed(response, 'log_in.html')
\ No newline at end of file
+        self.assertTemplateUsed(response, 'log_in.html')
+
+    def test_create_task_query_count(self):
+        self.client.login(username=self.user.username, password="Password123")
+        with self.assertNumQueries(3):
+            self.client.get(self.url)
+        with self.assertNumQueries(5):
+            self.client.post(self.url, self.data)
@@ -81,3 +81,9 @@ class DeleteTaskTest(TestCase):
         self.assertEqual(task_count_after, task_count_before)
         self.assertRedirects(response, redirect_url, status_code=302, target_status_code=200)
 
+    def test_delete_task_query_count(self):
+        self.client.login(username=self.user.username, password="Password123")
+        with self.assertNumQueries(3):
+            self.client.get(self.url)
+        with self.assertNumQueries(6):
+            self.client.post(self.url)
@@ -74,4 +74,22 @@ class EditTaskTest(TestCase):
         response = self.client.post(self.url, self.data, follow=True)
         task_count_after = Task.objects.count()
         self.assertEqual(task_count_after, task_count_before)
-        self.assertTemplateUsed(response, 'log_in.html')
\ No newline at end of file
+        self.assertTemplateUsed(response, 'log_in.html')
+
+    def test_invalid_edit_task_shows_the_stored_title(self):
+        self.client.login(username=self.user.username, password="Password123")
+        self.data['title'] = 'BOGUSTITLE'
+        self.data['due_date'] = '2000-02-01T12:00:00Z'
+        response = self.client.post(self.url, self.data)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, f"Edit Task: {self.task.title}")
+        self.assertNotContains(response, "Edit Task: BOGUSTITLE")
+        self.task.refresh_from_db()
+        self.assertNotEqual(self.task.title, 'BOGUSTITLE')
+
+    def test_edit_task_query_count(self):
+        self.client.login(username=self.user.username, password="Password123")
+        with self.assertNumQueries(3):
+            self.client.get(self.url)
+        with self.assertNumQueries(5):
+            self.client.post(self.url, self.data)
@@ -66,7 +66,7 @@ class LeaderboardViewTestCase(TestCase):
         members_list = response.context['members']
         user = members_list[0]
         teammate = members_list[1]
-        self.assertGreaterEqual(user.total_tasks_completed, teammate.total_tasks_completed)
+        self.assertGreaterEqual(user.points, teammate.points)
 
     def test_leaderboard_redirects_when_invalid_team_id_is_entered(self):
         self.client.login(username=self.user.username, password="Password123")
@@ -76,7 +76,7 @@ class LeaderboardViewTestCase(TestCase):
         self.assertRedirects(response, response_url, status_code=302, target_status_code=200)
         self.assertTemplateUsed(response, 'dashboard.html')
 
-
-
-    
-
+    def test_leaderboard_query_count(self):
+        self.client.login(username=self.user.username, password="Password123")
+        with self.assertNumQueries(3):
+            self.client.get(self.url)
@@ -1,7 +1,7 @@
 '''Unit test for toggling task status'''
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
-from tasks.models import Team, User, Task
+from tasks.models import Team, User, Task, Notification
 from tasks.tests.helpers import reverse_with_next
 
 class ToggleTaskStatusTestCase(TestCase):
@@ -73,7 +73,14 @@ class ToggleTaskStatusTestCase(TestCase):
         self.assertRedirects(response, response_url, status_code=302, target_status_code=200)
         self.assertTemplateUsed(response, 'dashboard.html')
 
+    @override_settings(NOTIFICATION_DISPATCH='thread')
+    def test_toggle_task_status_query_count(self):
+        self.myTeamTask.assigned_members.add(self.user)
+        self.client.login(username=self.user.username, password="Password123")
+        with self.assertNumQueries(7):
+            self.client.post(self.url)
 
-
-
-        
+    def test_completing_a_task_notifies_the_team_author(self):
+        self.client.login(username=self.teammate_1.username, password="Password123")
+        self.client.get(self.url)
+        self.assertTrue(Notification.objects.filter(user=self.user, title=f"Task completed: {self.myTeamTask.title}").exists())
@@ -1,5 +1,5 @@
 ''' Test case for Create Team view '''
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from tasks.models import Team, User
 from tasks.tests.helpers import reverse_with_next
@@ -88,4 +88,10 @@ class NewTeamTest(TestCase):
     def test_get_create_new_team_redirects_when_not_logged_in(self):
         redirect_url = reverse_with_next('log_in', self.url)
         response = self.client.get(self.url)
-        self.assertRedirects(response, redirect_url, status_code=302, target_status_code=200)
\ No newline at end of file
+        self.assertRedirects(response, redirect_url, status_code=302, target_status_code=200)
+
+    @override_settings(NOTIFICATION_DISPATCH='thread')
+    def test_create_team_query_count(self):
+        self.client.login(username=self.user.username, password="Password123")
+        with self.assertNumQueries(8):
+            self.client.post(self.url, self.data)
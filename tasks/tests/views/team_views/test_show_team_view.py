@@ -1,5 +1,7 @@
 """ Tests of the Show Team view """
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from tasks.models import Team, User, Task
 from tasks.tests.helpers import reverse_with_next
@@ -99,6 +101,49 @@ class ShowTeamViewTestCase(TestCase):
             # given task titles are different in the test fixtues
             self.assertNotContains(response, task.title) 
 
+    def test_show_team_ranks_members_from_their_team_scores(self):
+        self.myTeamTask1.assigned_members.add(self.teammate_1)
+        self.myTeamTask1.toggle_task_status()
+        self.myTeamTask1.save()
+        self.client.login(username=self.user.username, password="Password123")
+        response = self.client.get(self.url)
+        members = response.context['members']
+        self.assertEqual(members[0].user, self.teammate_1)
+        self.assertEqual(members[0].points, 1)
+
+    def test_show_team_does_not_write_to_the_database(self):
+        self.client.login(username=self.user.username, password="Password123")
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        writes = [query['sql'] for query in context.captured_queries if not query['sql'].startswith('SELECT')]
+        self.assertEqual(writes, [])
+
+    def test_show_team_query_count_does_not_grow_with_tasks_and_members(self):
+        self.client.login(username=self.user.username, password="Password123")
+        with self.assertNumQueries(8):
+            self.client.get(self.url)
+
+        other_users = User.objects.exclude(pk__in=[self.user.pk, self.teammate_1.pk])
+        self.team.members.add(*other_users)
+        for task in Task.objects.filter(author=self.team):
+            task.assigned_members.add(self.user, self.teammate_1, *other_users)
+        self.myTeamTask3.toggle_archive()
+        self.myTeamTask3.save()
+        # Archived tasks now have a page of their own, with its own prefetch of assigned members.
+        with self.assertNumQueries(9):
+            response = self.client.get(self.url)
+        self.assertContains(response, "Archived Tasks")
+
+    def test_show_team_marks_assigned_members_in_the_dropdown(self):
+        self.myTeamTask1.assigned_members.add(self.teammate_1)
+        self.client.login(username=self.user.username, password="Password123")
+        response = self.client.get(self.url)
+        assign_url = reverse('assign_member_to_task', kwargs={'task_id': self.myTeamTask1.id, 'user_id': self.teammate_1.id})
+        unassigned_url = reverse('assign_member_to_task', kwargs={'task_id': self.myTeamTask1.id, 'user_id': self.user.id})
+        self.assertContains(response, f'<a class="dropdown-item active" href="{assign_url}">', html=False)
+        self.assertContains(response, f'<a class="dropdown-item" href="{unassigned_url}">', html=False)
+
     def test_other_user_not_team_cannot_view_team(self):
         other_user = User.objects.get(username='@ericjoker')
         self.client.login(username=other_user.username, password="Password123")
@@ -78,4 +78,11 @@ class TeamViewTestCase(TestCase):
         redirect_url = reverse('show_team', kwargs={'team_id': self.team.id})
         team_count_after = Team.objects.count()
         self.assertEqual(team_count_after, team_count_before)
-        self.assertRedirects(response, redirect_url, status_code=302, target_status_code=200)
\ No newline at end of file
+        self.assertRedirects(response, redirect_url, status_code=302, target_status_code=200)
+
+    def test_delete_team_query_count(self):
+        self.client.login(username=self.user.username, password="Password123")
+        with self.assertNumQueries(3):
+            self.client.get(self.url)
+        with self.assertNumQueries(8):
+            self.client.post(self.url)
@@ -70,4 +70,22 @@ class TeamViewTestCase(TestCase):
         response = self.client.post(self.url, self.data, follow=True)
         team_count_after = Team.objects.count()
         self.assertEqual(team_count_after, team_count_before)
-        self.assertTemplateUsed(response, 'log_in.html')
\ No newline at end of file
+        self.assertTemplateUsed(response, 'log_in.html')
+
+    def test_invalid_edit_team_shows_the_stored_title(self):
+        self.client.login(username=self.user.username, password="Password123")
+        self.data['title'] = 'BOGUSTITLE'
+        self.data['description'] = 'x' * 281
+        response = self.client.post(self.url, self.data)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, f"Edit Team: {self.team.title}")
+        self.assertNotContains(response, "Edit Team: BOGUSTITLE")
+        self.team.refresh_from_db()
+        self.assertNotEqual(self.team.title, 'BOGUSTITLE')
+
+    def test_edit_team_query_count(self):
+        self.client.login(username=self.user.username, password="Password123")
+        with self.assertNumQueries(3):
+            self.client.get(self.url)
+        with self.assertNumQueries(4):
+            self.client.post(self.url, self.data)
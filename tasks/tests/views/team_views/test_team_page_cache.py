@@ -0,0 +1,121 @@
+""" Tests of the cached fragments of the team page """
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from tasks.models import User, Team, Task
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class TeamPageCacheTestCase(TestCase):
+    """ Tests of the cached fragments of the team page """
+
+    fixtures = [
+        'tasks/tests/fixtures/default_user.json',
+        'tasks/tests/fixtures/other_users.json',
+        'tasks/tests/fixtures/default_team.json',
+        'tasks/tests/fixtures/default_task.json'
+    ]
+
+    def setUp(self):
+        super(TestCase, self).setUp()
+        cache.clear()
+        self.user = User.objects.get(username="@johndoe")
+        self.teammate = User.objects.get(username="@janedoe")
+        self.team = Team.objects.get(pk=1)
+        self.team.members.add(self.user, self.teammate)
+        self.task = Task.objects.get(pk=1)
+        self.url = reverse('show_team', kwargs={'team_id': self.team.id})
+        self.client.login(username=self.user.username, password="Password123")
+
+    def _version(self):
+        return Team.objects.get(pk=self.team.pk).cache_version
+
+    def test_repeat_view_of_an_unchanged_team_skips_the_fragment_queries(self):
+        first = self.client.get(self.url)
+        # Session, user and team lookups only.
+        with self.assertNumQueries(3):
+            second = self.client.get(self.url)
+        self.assertContains(second, self.task.title)
+        self.assertContains(second, self.teammate.username)
+        self.assertTemplateNotUsed(second, 'partials/task_table_rows.html')
+        self.assertTemplateUsed(first, 'partials/task_table_rows.html')
+
+    def test_cached_page_keeps_the_viewers_csrf_token_valid(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+        csrf_client = self.client_class(enforce_csrf_checks=True)
+        csrf_client.login(username=self.user.username, password="Password123")
+        csrf_client.get(self.url)
+        response = csrf_client.get(self.url)
+        toggle_url = reverse('task_toggle', kwargs={'task_id': self.task.id})
+        toggle_form = response.content.decode().split(f'action="{toggle_url}"')[1]
+        token = toggle_form.split('name="csrfmiddlewaretoken" value="')[1].split('"')[0]
+        toggle = csrf_client.post(toggle_url, {'csrfmiddlewaretoken': token})
+        self.assertEqual(toggle.status_code, 302)
+
+    def test_other_viewers_are_not_served_the_authors_fragments(self):
+        self.client.get(self.url)
+        self.client.login(username=self.teammate.username, password="Password123")
+        response = self.client.get(self.url)
+        self.assertNotContains(response, reverse('team_delete', kwargs={'team_id': self.team.id}))
+
+    def test_new_task_is_shown_on_the_next_view(self):
+        self.client.get(self.url)
+        Task.objects.create(author=self.team, title="Freshly Added", description="New", due_date=self.task.due_date)
+        self.assertContains(self.client.get(self.url), "Freshly Added")
+
+    def test_edited_task_is_shown_on_the_next_view(self):
+        self.client.get(self.url)
+        self.task.title = "Renamed Task"
+        self.task.save()
+        self.assertContains(self.client.get(self.url), "Renamed Task")
+
+    def test_edited_team_is_shown_on_the_next_view(self):
+        self.client.get(self.url)
+        self.team.description = "A brand new description"
+        self.team.save()
+        self.assertEqual(self.team.cache_version, self._version())
+        self.assertContains(self.client.get(self.url), "A brand new description")
+
+    def test_editing_a_stale_team_never_reuses_a_version(self):
+        stale_team = Team.objects.get(pk=self.team.pk)
+        self.task.title = "Renamed Task"
+        self.task.save()
+        version = self._version()
+        stale_team.save()
+        self.assertEqual(self._version(), version + 1)
+
+    def test_deleting_a_task_bumps_the_version(self):
+        version = self._version()
+        self.task.delete()
+        self.assertEqual(self._version(), version + 1)
+
+    def test_assigning_members_bumps_the_version(self):
+        version = self._version()
+        self.task.assigned_members.add(self.teammate)
+        self.assertEqual(self._version(), version + 1)
+        self.teammate.tasks.remove(self.task)
+        self.assertEqual(self._version(), version + 2)
+        self.task.assigned_members.add(self.teammate)
+        self.teammate.tasks.clear()
+        self.assertEqual(self._version(), version + 4)
+
+    def test_membership_changes_bump_the_version(self):
+        version = self._version()
+        self.team.members.remove(self.teammate)
+        self.assertEqual(self._version(), version + 1)
+        self.teammate.teams.add(self.team)
+        self.assertEqual(self._version(), version + 2)
+        self.teammate.teams.clear()
+        self.assertEqual(self._version(), version + 3)
+
+    def test_renamed_member_bumps_the_version(self):
+        version = self._version()
+        self.teammate.first_name = "Janet"
+        self.teammate.save()
+        self.assertEqual(self._version(), version + 1)
+
+    def test_logging_in_does_not_bump_the_version(self):
+        version = self._version()
+        self.client.login(username=self.teammate.username, password="Password123")
+        self.assertEqual(self._version(), version)
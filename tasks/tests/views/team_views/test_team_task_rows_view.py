@@ -0,0 +1,83 @@
+""" Tests of the views rendering further pages of a team's tasks """
+from datetime import timedelta
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from tasks.models import Team, User, Task
+from tasks.pagination import TASK_PAGE_SIZE
+
+
+class TeamTaskRowsViewTestCase(TestCase):
+    """ Tests of the views rendering further pages of a team's tasks """
+
+    fixtures = [
+        'tasks/tests/fixtures/default_user.json',
+        'tasks/tests/fixtures/other_users.json',
+        'tasks/tests/fixtures/default_team.json',
+        'tasks/tests/fixtures/other_teams.json',
+        'tasks/tests/fixtures/default_task.json',
+        'tasks/tests/fixtures/other_tasks.json'
+    ]
+
+    def setUp(self):
+        super(TestCase, self).setUp()
+        self.user = User.objects.get(username="@johndoe")
+        self.other_user = User.objects.get(username="@petrapickles")
+        self.team = Team.objects.get(pk=1)
+        self.team.members.add(self.user)
+        # Tasks sharing a due date are ordered by id, so the pages must not skip or repeat any of them.
+        due_date = timezone.now() + timedelta(days=365)
+        Task.objects.bulk_create([
+            Task(author=self.team, title=f"Paged Task {index}", description="Paged task", due_date=due_date)
+            for index in range(TASK_PAGE_SIZE + 5)
+        ])
+        self.show_team_url = reverse('show_team', kwargs={'team_id': self.team.id})
+        self.rows_url = reverse('team_task_rows', kwargs={'team_id': self.team.id})
+        self.archived_rows_url = reverse('archived_task_rows', kwargs={'team_id': self.team.id})
+
+    def _titles(self, page):
+        return [task.title for task in page]
+
+    def test_team_task_rows_url(self):
+        self.assertEqual(self.rows_url, f'/team/{self.team.id}/tasks')
+
+    def test_show_team_renders_the_first_page_with_a_load_more_link(self):
+        self.client.login(username=self.user.username, password="Password123")
+        response = self.client.get(self.show_team_url)
+        unarchived = response.context['unarchived']
+        self.assertEqual(len(unarchived), TASK_PAGE_SIZE)
+        self.assertContains(response, f'{self.rows_url}?after={unarchived.next_cursor}')
+
+    def test_load_more_returns_every_remaining_task_once(self):
+        self.client.login(username=self.user.username, password="Password123")
+        first_page = self.client.get(self.show_team_url).context['unarchived']
+        response = self.client.get(self.rows_url, {'after': first_page.next_cursor})
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'partials/task_table_rows.html')
+        second_page = response.context['tasks']
+        self.assertFalse(second_page.has_next)
+        self.assertNotContains(response, 'data-load-more')
+        titles = self._titles(first_page) + self._titles(second_page)
+        expected = Task.objects.filter(author=self.team, is_archived=False).order_by('due_date', 'pk')
+        self.assertEqual(titles, [task.title for task in expected])
+
+    def test_archived_tasks_are_paged_separately(self):
+        Task.objects.filter(author=self.team, title__startswith="Paged Task").update(is_archived=True)
+        self.client.login(username=self.user.username, password="Password123")
+        response = self.client.get(self.show_team_url)
+        archived = response.context['archived']
+        self.assertEqual(len(archived), TASK_PAGE_SIZE)
+        self.assertNotIn("Paged Task", ''.join(self._titles(response.context['unarchived'])))
+        response = self.client.get(self.archived_rows_url, {'after': archived.next_cursor})
+        self.assertTemplateUsed(response, 'partials/archived_task_rows.html')
+        self.assertEqual(len(response.context['tasks']), 5)
+
+    def test_invalid_cursor_is_not_found(self):
+        self.client.login(username=self.user.username, password="Password123")
+        response = self.client.get(self.rows_url, {'after': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_non_member_is_redirected(self):
+        self.client.login(username=self.other_user.username, password="Password123")
+        response = self.client.get(self.rows_url)
+        self.assertRedirects(response, reverse('dashboard'), status_code=302, target_status_code=200)
@@ -2,6 +2,7 @@
 from django.test import TestCase
 from django.urls import reverse
 from tasks.models import Team, User, Task
+from tasks.pagination import TASK_PAGE_SIZE
 from tasks.tests.helpers import reverse_with_next
 from django.db.models import Q
 from datetime import datetime
@@ -132,3 +133,59 @@ class DashboardViewTestCase(TestCase):
 
 
 
+
+    def test_dashboard_marks_only_late_tasks_as_overdue(self):
+        self.client.login(username=self.user.username, password="Password123")
+        late_task = Task.objects.get(pk=2)
+        Task.objects.filter(pk=late_task.pk).update(due_date=datetime.fromisoformat("2004-02-01T12:00:00+00:00"))
+        self.task.assigned_members.add(self.user)
+        late_task.assigned_members.add(self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['late_tasks'], [late_task])
+        self.assertEqual(response.context['late_task_text'], late_task.title)
+        self.assertContains(response, 'overdue-task', count=1)
+
+    def test_dashboard_summarises_many_late_tasks(self):
+        self.client.login(username=self.user.username, password="Password123")
+        late_tasks = Task.objects.bulk_create([
+            Task(author=self.team_own1, title=f"Late {index}", description="Late task",
+                 due_date=datetime.fromisoformat("2004-02-01T12:00:00+00:00"))
+            for index in range(12)
+        ])
+        self.user.tasks.add(*late_tasks)
+        response = self.client.get(self.url)
+        self.assertTrue(response.context['late_task_text'].endswith(" and 2 more."))
+
+    def test_dashboard_query_count_does_not_grow_with_tasks(self):
+        self.client.login(username=self.user.username, password="Password123")
+        self.user.tasks.add(*Task.objects.all())
+        with self.assertNumQueries(6):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.context['user_tasks']), Task.objects.count())
+        self.assertContains(response, Task.objects.get(pk=5).author.title)
+
+    def test_dashboard_pages_tasks_with_load_more(self):
+        self.client.login(username=self.user.username, password="Password123")
+        tasks = Task.objects.bulk_create([
+            Task(author=self.team_own1, title=f"Paged {index}", description="Paged task",
+                 due_date=datetime.fromisoformat("2099-02-01T12:00:00+00:00"))
+            for index in range(TASK_PAGE_SIZE + 3)
+        ])
+        self.user.tasks.add(*tasks)
+        response = self.client.get(self.url)
+        first_page = response.context['user_tasks']
+        self.assertEqual(len(first_page), TASK_PAGE_SIZE)
+        self.assertContains(response, f"Your Tasks ({len(tasks)})")
+        rows_url = reverse('dashboard_task_rows')
+        self.assertContains(response, f'{rows_url}?after={first_page.next_cursor}')
+
+        response = self.client.get(rows_url, {'after': first_page.next_cursor})
+        self.assertTemplateUsed(response, 'partials/dashboard_task_rows.html')
+        titles = [task.title for task in first_page] + [task.title for task in response.context['tasks']]
+        self.assertEqual(sorted(titles), sorted(task.title for task in tasks))
+        self.assertNotContains(response, 'data-load-more')
+
+    def test_dashboard_task_rows_redirects_when_not_logged_in(self):
+        url = reverse('dashboard_task_rows')
+        response = self.client.get(url)
+        self.assertRedirects(response, reverse_with_next("log_in", url), status_code=302, target_status_code=200)
@@ -0,0 +1,76 @@
+""" Tests of the query budget middleware """
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from tasks.models import Team, User
+from tasks.query_budget import QueryBudgetExceeded, normalize_sql, repeated_queries
+from tasks.tests.helpers import QueryBudgetTesterMixin
+
+
+class QueryBudgetMiddlewareTestCase(TestCase, QueryBudgetTesterMixin):
+    """ Tests of the query budget middleware """
+
+    fixtures = [
+        'tasks/tests/fixtures/default_user.json',
+        'tasks/tests/fixtures/other_users.json',
+        'tasks/tests/fixtures/default_team.json',
+        'tasks/tests/fixtures/other_teams.json'
+    ]
+
+    def setUp(self):
+        super(TestCase, self).setUp()
+        self.user = User.objects.get(username="@johndoe")
+        self.team = Team.objects.get(pk=1)
+        self.team.members.add(self.user)
+        self.url = reverse('dashboard')
+        self.client.login(username=self.user.username, password="Password123")
+
+    def test_response_summarises_its_queries(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Query-Budget'], "queries=6; budget=6; repeated=0")
+
+    @override_settings(QUERY_BUDGETS={'dashboard': 2})
+    def test_request_over_budget_raises(self):
+        with self.assertRaisesMessage(QueryBudgetExceeded, "dashboard ran 6 queries, over its budget of 2"):
+            self.client.get(self.url)
+
+    @override_settings(QUERY_BUDGETS={'dashboard': 2}, QUERY_BUDGET_ACTION='log')
+    def test_request_over_budget_is_logged_when_not_raising(self):
+        with self.assertLogs('tasks.middleware', level='WARNING') as logs:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("over its budget of 2", logs.output[0])
+
+    @override_settings(QUERY_BUDGETS={}, QUERY_BUDGET_DEFAULT=None)
+    def test_view_without_budget_is_not_limited(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Query-Budget'], "queries=6; budget=none; repeated=0")
+
+    @override_settings(QUERY_BUDGET_ENABLED=False)
+    def test_disabled_middleware_adds_no_header(self):
+        response = self.client.get(self.url)
+        self.assertFalse(response.has_header('X-Query-Budget'))
+
+    def test_normalized_sql_ignores_literals_and_parameter_lists(self):
+        self.assertEqual(
+            normalize_sql("SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'x' LIMIT 21"),
+            normalize_sql("SELECT * FROM t WHERE id IN (%s) AND name = 'y''s' LIMIT 1"),
+        )
+
+    def test_repeated_query_shapes_are_detected(self):
+        queries = [f'SELECT * FROM "tasks_team" WHERE "id" = {pk}' for pk in range(3)]
+        self.assertEqual(list(repeated_queries(queries, threshold=3).values()), [3])
+        self.assertEqual(repeated_queries(queries[:2], threshold=3), {})
+
+    def test_savepoints_are_not_repeated_queries(self):
+        queries = [f'SAVEPOINT "s1_x{index}"' for index in range(5)]
+        self.assertEqual(repeated_queries(queries, threshold=3), {})
+
+    def test_mixin_passes_code_within_budget(self):
+        with self.assert_within_query_budget('dashboard'):
+            self.client.get(self.url)
+
+    def test_mixin_fails_on_n_plus_one(self):
+        with self.assertRaisesMessage(AssertionError, "repeated a query 3 times"):
+            with self.assert_within_query_budget('show_team', budget=10):
+                for team in Team.objects.filter(pk__in=[1, 2, 3]):
+                    team.author.username
@@ -0,0 +1,64 @@
+""" Tests of routing the reads of read-only views to the replica """
+from io import StringIO
+from unittest import skipUnless
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from tasks.middleware import ReplicaRoutingMiddleware
+from tasks.models import Invitation, Notification, Task, Team, User
+
+REPLICA_CONFIGURED = 'replica' in settings.DATABASES
+
+@skipUnless(REPLICA_CONFIGURED, "The test suite only has a replica of SQLite databases")
+# The query budgets are measured within TestCase's transaction, without the BEGIN statements seen here.
+@override_settings(REPLICA_DATABASE='replica', QUERY_BUDGET_ENABLED=False)
+class ReplicaRoutingTestCase(TransactionTestCase):
+    """ Tests of routing the reads of read-only views to the replica """
+
+    # Declared only when it exists, as the test runner sets up the databases of skipped tests too.
+    databases = {'default', 'replica'} if REPLICA_CONFIGURED else {'default'}
+    fixtures = [
+        'tasks/tests/fixtures/default_user.json',
+        'tasks/tests/fixtures/other_users.json',
+        'tasks/tests/fixtures/default_team.json',
+        'tasks/tests/fixtures/other_teams.json',
+        'tasks/tests/fixtures/default_task.json'
+    ]
+
+    def setUp(self):
+        super(TransactionTestCase, self).setUp()
+        self.user = User.objects.get(username="@johndoe")
+        self.team = Team.objects.get(pk=1)
+        self.team.members.add(self.user)
+        self.task = Task.objects.get(pk=1)
+        self.client.login(username=self.user.username, password="Password123")
+        self.team_url = reverse('show_team', kwargs={'team_id': self.team.id})
+        # The replica is a copy of the primary as it stands now, and falls behind from here on.
+        call_command('refresh_sqlite_replica', stdout=StringIO())
+        Task.objects.filter(pk=self.task.pk).update(title="Written after the copy")
+
+    def test_read_only_view_reads_from_the_replica(self):
+        response = self.client.get(self.team_url)
+        self.assertContains(response, self.task.title)
+        self.assertNotContains(response, "Written after the copy")
+        self.assertNotIn(ReplicaRoutingMiddleware.PIN_COOKIE, response.cookies)
+
+    def test_other_views_read_from_the_primary(self):
+        response = self.client.get(reverse('edit_task', kwargs={'task_id': self.task.id}))
+        self.assertContains(response, "Written after the copy")
+
+    def test_writing_pins_the_user_to_the_primary(self):
+        response = self.client.get(reverse('task_toggle', kwargs={'task_id': self.task.id}))
+        self.assertIn(ReplicaRoutingMiddleware.PIN_COOKIE, response.cookies)
+        self.assertContains(self.client.get(self.team_url), "Written after the copy")
+
+    def test_reads_after_a_write_in_the_same_request_use_the_primary(self):
+        other_team = Team.objects.get(pk=2)
+        invitation = Invitation.objects.create(team=other_team, email=self.user.email, status=Invitation.INVITED)
+        response = self.client.get(reverse('notifications'))
+        self.assertContains(response, other_team.title)
+        self.assertIn(ReplicaRoutingMiddleware.PIN_COOKIE, response.cookies)
+        del self.client.cookies[ReplicaRoutingMiddleware.PIN_COOKIE]
+        self.client.get(reverse('notifications'))
+        self.assertEqual(Notification.objects.filter(invitation=invitation).count(), 1)
@@ -0,0 +1,83 @@
+""" Tests of the request stats view and the instrumentation behind it """
+import os
+import tempfile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from tasks.instrumentation import request_stats
+from tasks.models import User
+
+
+class RequestStatsViewTestCase(TestCase):
+    """ Tests of the request stats view and the instrumentation behind it """
+
+    fixtures = [
+        'tasks/tests/fixtures/default_user.json',
+        'tasks/tests/fixtures/default_team.json'
+    ]
+
+    def setUp(self):
+        super(TestCase, self).setUp()
+        self.user = User.objects.get(username="@johndoe")
+        self.user.is_staff = True
+        self.user.save()
+        self.url = reverse('request_stats')
+        self.client.login(username=self.user.username, password="Password123")
+        request_stats.reset()
+
+    def test_request_stats_url(self):
+        self.assertEqual(self.url, '/stats/')
+
+    def test_non_staff_user_cannot_see_stats(self):
+        self.user.is_staff = False
+        self.user.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+
+    def test_stats_split_each_url_name_into_database_template_and_python_time(self):
+        self.client.get(reverse('dashboard'))
+        self.client.get(reverse('dashboard'))
+        stats = self.client.get(self.url).json()
+        dashboard = stats['dashboard']
+        self.assertEqual(dashboard['requests'], 2)
+        self.assertEqual(dashboard['mean_queries'], 6)
+        self.assertGreater(dashboard['mean_db_time'], 0)
+        self.assertGreater(dashboard['mean_template_time'], 0)
+        self.assertGreater(dashboard['mean_response_size'], 0)
+        self.assertAlmostEqual(
+            dashboard['mean_wall_time'],
+            dashboard['mean_db_time'] + dashboard['mean_template_time'] + dashboard['mean_python_time'],
+        )
+        self.assertLessEqual(dashboard['p50_wall_time'], dashboard['p95_wall_time'])
+        self.assertEqual(dashboard['histogram']['10'], 2)
+
+    @override_settings(INSTRUMENTATION_WINDOW=2)
+    def test_histogram_covers_only_recent_requests(self):
+        for _ in range(3):
+            self.client.get(reverse('dashboard'))
+        dashboard = self.client.get(self.url).json()['dashboard']
+        self.assertEqual(dashboard['requests'], 3)
+        self.assertEqual(dashboard['recent'], 2)
+        self.assertEqual(dashboard['histogram']['10'], 2)
+
+    def test_stats_in_prometheus_format(self):
+        self.client.get(reverse('dashboard'))
+        response = self.client.get(self.url, {'format': 'prometheus'})
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        text = response.content.decode()
+        self.assertIn('# TYPE task_manager_request_seconds histogram', text)
+        self.assertIn('task_manager_request_seconds_count{view="dashboard"} 1', text)
+        self.assertIn('task_manager_request_seconds_bucket{view="dashboard",le="+Inf"} 1', text)
+        self.assertIn('task_manager_request_queries_total{view="dashboard"} 6', text)
+
+    def test_stats_are_dumped_to_a_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'task_manager.prom')
+            with override_settings(INSTRUMENTATION_DUMP_PATH=path, INSTRUMENTATION_DUMP_INTERVAL=0):
+                self.client.get(reverse('dashboard'))
+            with open(path) as dump:
+                self.assertIn('task_manager_request_seconds_count{view="dashboard"} 1', dump.read())
+
+    @override_settings(INSTRUMENTATION_ENABLED=False)
+    def test_disabled_instrumentation_records_nothing(self):
+        self.client.get(reverse('dashboard'))
+        self.assertEqual(request_stats.summary(), {})
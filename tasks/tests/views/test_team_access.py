@@ -0,0 +1,76 @@
+"""Tests of the team membership authorisation shared by the team and task views."""
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory, TestCase
+from tasks.helpers import get_team_access
+from tasks.models import User, Team, Task
+
+class TeamAccessTestCase(TestCase):
+    """Tests of the team membership authorisation shared by the team and task views."""
+
+    fixtures = [
+        'tasks/tests/fixtures/default_user.json',
+        'tasks/tests/fixtures/other_users.json',
+        'tasks/tests/fixtures/default_team.json',
+        'tasks/tests/fixtures/other_teams.json',
+        'tasks/tests/fixtures/default_task.json',
+        'tasks/tests/fixtures/other_tasks.json'
+    ]
+
+    def setUp(self):
+        self.user = User.objects.get(username='@johndoe')
+        self.teammate_1 = User.objects.get(username='@janedoe')
+        self.other_user = User.objects.get(username='@petrapickles')
+        self.team = Team.objects.get(pk=1)
+        self.team.members.add(self.user, self.teammate_1)
+        self.task = Task.objects.get(pk=1)
+
+    def _request(self, user):
+        request = RequestFactory().get('/')
+        request.user = user
+        return request
+
+    def test_team_author_who_is_a_member_is_member_and_author(self):
+        access = get_team_access(self._request(self.user), team_id=self.team.id)
+        self.assertEqual(access.team, self.team)
+        self.assertTrue(access.is_member)
+        self.assertTrue(access.is_author)
+
+    def test_team_member_is_not_author(self):
+        access = get_team_access(self._request(self.teammate_1), team_id=self.team.id)
+        self.assertTrue(access.is_member)
+        self.assertFalse(access.is_author)
+
+    def test_team_author_who_left_is_member_but_not_author(self):
+        self.team.members.remove(self.user)
+        access = get_team_access(self._request(self.user), team_id=self.team.id)
+        self.assertTrue(access.is_member)
+        self.assertFalse(access.is_author)
+
+    def test_other_user_is_neither_member_nor_author(self):
+        access = get_team_access(self._request(self.other_user), team_id=self.team.id)
+        self.assertFalse(access.is_member)
+        self.assertFalse(access.is_author)
+
+    def test_anonymous_user_is_not_a_member(self):
+        access = get_team_access(self._request(AnonymousUser()), team_id=self.team.id)
+        self.assertFalse(access.is_member)
+
+    def test_task_access_loads_task_and_team_in_a_single_query(self):
+        request = self._request(self.teammate_1)
+        with self.assertNumQueries(1):
+            access = get_team_access(request, task_id=self.task.id)
+            self.assertEqual(access.task, self.task)
+            self.assertEqual(access.team, self.team)
+            self.assertEqual(access.team.author, self.user)
+            self.assertTrue(access.is_member)
+
+    def test_access_is_cached_on_the_request(self):
+        request = self._request(self.user)
+        access = get_team_access(request, team_id=self.team.id)
+        with self.assertNumQueries(0):
+            self.assertIs(get_team_access(request, team_id=self.team.id), access)
+
+    def test_missing_team_or_task_has_no_access(self):
+        request = self._request(self.user)
+        self.assertIsNone(get_team_access(request, team_id=9999))
+        self.assertIsNone(get_team_access(request, task_id=9999))
@@ -5,4 +5,5 @@ from .task_views import *
 from .notification_views import *
 from .static_views import *
 from .invitation_views import *
-from .dashboard_views import *
\ No newline at end of file
+from .dashboard_views import *
+from .stats_views import *
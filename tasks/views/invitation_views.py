@@ -1,14 +1,15 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404, redirect, render
-from tasks.models import Notification, Invitation, Team
-from tasks.helpers import team_member_prohibited_to_view_team
+from tasks import events
+from tasks.models import Notification, Invitation
+from tasks.helpers import get_team_access, team_member_prohibited_to_view_team
 from tasks.forms import TeamInviteForm
 
 @login_required
 @team_member_prohibited_to_view_team
 def invite(request, team_id):
-    team = get_object_or_404(Team, pk=team_id)
+    team = get_team_access(request, team_id=team_id).team
 
     if request.user != team.author:
         messages.error(request, "You do not have permission to invite members to this team.")
@@ -23,6 +24,7 @@ def invite(request, team_id):
             email=user_email,
             status=Invitation.INVITED
         )
+        events.publish(events.INVITATION_SENT, invitation_id=invitation.pk, user_id=form.invited_user.pk)
         messages.success(request, 'Invitation sent successfully.')
 
         return redirect('show_team', team_id=team_id)
@@ -42,16 +44,8 @@ def accept_invitation(request, invitation_id):
     invitation.team.members.add(request.user)
     invitation.status = Invitation.ACCEPTED
     invitation.save()
-    try:
-        notification = Notification.objects.get(user=request.user, invitation=invitation)
-        notification.delete()
-    except Notification.DoesNotExist:
-        redirect('dashboard')
-    Notification.objects.create(
-                user=request.user,
-                title=f"Joined a team",
-                description=f"You have joined {invitation.team.title}",
-                actionable=False)
+    Notification.objects.filter(user=request.user, invitation=invitation).delete()
+    events.publish(events.INVITATION_ACCEPTED, invitation_id=invitation.pk, user_id=request.user.pk)
 
     messages.success(request, "You have joined the team!")
     return redirect('notifications')
@@ -63,11 +57,8 @@ def decline_invitation(request, invitation_id):
     if invitation.status != Invitation.DECLINED:
         invitation.status = Invitation.DECLINED
         invitation.save()
-        try:
-            notification = Notification.objects.get(user=request.user, invitation=invitation)
-            notification.delete()
-        except Notification.DoesNotExist:
-            redirect('dashboard')
+        Notification.objects.filter(user=request.user, invitation=invitation).delete()
+        events.publish(events.INVITATION_DECLINED, invitation_id=invitation.pk, user_id=request.user.pk)
 
         messages.success(request, "You have declined the invitation.")
     else:
@@ -1,6 +1,5 @@
 from django.shortcuts import redirect
-from django.core.exceptions import ObjectDoesNotExist
-from tasks.models import Team, Task
+from tasks.helpers import get_team_access
 from django.conf import settings
 from django.http import Http404
 from django.urls import reverse
@@ -17,23 +16,14 @@ class TeamMemberProhibitedMixin:
         team_id = kwargs.get('team_id', None)
         task_id = kwargs.get('task_id', None)
 
-        if team_id != None:
-            try:
-                current_team = Team.objects.get(id=team_id)
-            except ObjectDoesNotExist:
-                raise Http404("Team does not exist")
-
-            if not self.user_is_team_member(current_team):
-                return self.handle_not_team_member(*args, **kwargs)
-
-        if task_id != None:
-            try: 
-                current_task = Task.objects.get(id=task_id)
-                current_team = Team.objects.get(id=current_task.author.id)
-            except ObjectDoesNotExist:
+        if team_id is not None or task_id is not None:
+            self.team_access = get_team_access(self.request, team_id=team_id, task_id=task_id)
+            if self.team_access is None:
+                if task_id is None:
+                    raise Http404("Team does not exist")
                 return redirect(settings.REDIRECT_URL_WHEN_LOGGED_IN)
 
-            if not self.user_is_team_member(current_team):
+            if not self.user_is_team_member(self.team_access):
                 return self.handle_not_team_member(*args, **kwargs)
 
         return super().dispatch(*args, **kwargs)
@@ -42,8 +32,8 @@ class TeamMemberProhibitedMixin:
         url = self.get_redirect_when_not_team_member()
         return redirect(url)
 
-    def user_is_team_member(self, team):
-        return self.request.user.is_authenticated and (self.request.user in team.members.all() or self.request.user == team.author)
+    def user_is_team_member(self, team_access):
+        return team_access.is_member
 
     def get_redirect_when_not_team_member(self):
         """Returns the url to redirect to when user is not team member."""
@@ -66,23 +56,14 @@ class TeamAuthorProhibitedMixin:
         team_id = kwargs.get('team_id', None)
         task_id = kwargs.get('task_id', None)
 
-        if team_id is not None:
-            try:
-                current_team = Team.objects.get(id=team_id)
-            except ObjectDoesNotExist:
-                raise Http404("Team does not exist")
-
-            if not self.user_is_team_author(current_team):
-                return self.handle_not_team_author(*args, **kwargs)
-
-        if task_id != None:
-            try: 
-                current_task = Task.objects.get(id=task_id)
-                current_team = Team.objects.get(id=current_task.author.id)
-            except ObjectDoesNotExist:
+        if team_id is not None or task_id is not None:
+            self.team_access = get_team_access(self.request, team_id=team_id, task_id=task_id)
+            if self.team_access is None:
+                if task_id is None:
+                    raise Http404("Team does not exist")
                 return redirect(settings.REDIRECT_URL_WHEN_LOGGED_IN)
 
-            if not self.user_is_team_author(current_team):
+            if not self.user_is_team_author(self.team_access):
                 return self.handle_not_team_author(*args, **kwargs)
 
         return super().dispatch(*args, **kwargs)
@@ -92,8 +73,8 @@ class TeamAuthorProhibitedMixin:
         messages.add_message(self.request, messages.ERROR, "You cannot perform this task because you are not creator of the team")
         return redirect(url)
 
-    def user_is_team_author(self, team):
-        return self.request.user.is_authenticated and self.request.user == team.author and self.request.user in team.members.all()
+    def user_is_team_author(self, team_access):
+        return team_access.is_author
 
     def get_redirect_when_not_team_author(self):
         """Returns the url to redirect to when user is not team author."""
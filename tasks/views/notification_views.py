@@ -1,22 +1,19 @@
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
 from django.shortcuts import redirect, render
-from tasks.models import Notification, Invitation
+from django.utils.functional import SimpleLazyObject
+from tasks.caching import versioned_key
+from tasks.models import Notification
+from tasks.notifications import create_missing_invitation_notifications
 
 @login_required
 def notifications(request):
     """Display Notifications associated with the user, including invitations."""
-    invitations = Invitation.objects.filter(email=request.user.email, status=Invitation.INVITED)
-    for invitation in invitations:
-        if not Notification.objects.filter(user=request.user, invitation=invitation).exists():
-            notif = Notification.objects.create(
-                user=request.user,
-                title=f"Invitation to join {invitation.team.title}",
-                description="",
-                actionable=True,
-                invitation=invitation
-            )
-    user_notifications = Notification.objects.filter(user=request.user)
+    if create_missing_invitation_notifications(request.user):
+        request.user.refresh_from_db(fields=['unseen_notification_count', 'cache_version'])
+    user_notifications = list(Notification.objects.filter(user=request.user).select_related('invitation'))
     return render(request, 'notifications.html', {'user_notifications': user_notifications})
 
 @login_required
@@ -33,8 +30,18 @@ def seen_notification(request, notification_id):
 
 
 def unseen_notifications(request):
+    """Context processor exposing the user's unseen notification count, and lazily the notifications themselves.
+
+    The notifications are cached until the user's cache version is bumped by a change to them.
+    """
     unseen_notifs = []
+    unseen_notifs_count = 0
     if request.user.is_authenticated:
-        unseen_notifs = Notification.objects.filter(user=request.user, seen=False)
-    
-    return {'unseen_notifs': unseen_notifs}
\ No newline at end of file
+        unseen_notifs = SimpleLazyObject(lambda: cache.get_or_set(
+            versioned_key(request.user, 'unseen_notifications'),
+            lambda: list(Notification.objects.filter(user=request.user, seen=False).select_related('invitation')),
+            settings.UNSEEN_NOTIFICATIONS_CACHE_TIMEOUT,
+        ))
+        unseen_notifs_count = request.user.unseen_notification_count
+
+    return {'unseen_notifs': unseen_notifs, 'unseen_notifs_count': unseen_notifs_count}
\ No newline at end of file
@@ -0,0 +1,11 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse, JsonResponse
+from tasks.instrumentation import request_stats
+
+
+@staff_member_required
+def request_stats_view(request):
+    """Show staff the recent timings of each URL name, or the running totals in Prometheus format with ?format=prometheus."""
+    if request.GET.get('format') == 'prometheus':
+        return HttpResponse(request_stats.prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
+    return JsonResponse(request_stats.summary())
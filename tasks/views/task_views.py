@@ -1,11 +1,13 @@
+from copy import copy
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import redirect
 from django.views.generic.edit import UpdateView, DeleteView, CreateView
 from django.urls import reverse
+from tasks import events
 from tasks.forms import TaskForm
-from tasks.helpers import team_member_prohibited_to_view_team
+from tasks.helpers import get_request_object, get_team_access, team_member_prohibited_to_view_team
 from django.db.models import Q
 from tasks.models import Team, Task, User
 from django.core.exceptions import ObjectDoesNotExist
@@ -25,12 +27,12 @@ class CreateTaskView(LoginRequiredMixin, TeamMemberProhibitedMixin, CreateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         team_id = self.kwargs['team_id']
-        context['team'] = Team.objects.get(id=team_id)
+        context['team'] = get_request_object(self.request, Team, team_id)
         return context
 
     def form_valid(self, form):
         team_id = self.kwargs['team_id']
-        current_team = Team.objects.get(id=team_id)
+        current_team = get_request_object(self.request, Team, team_id)
         form.instance.author = current_team
         messages.add_message(self.request, messages.SUCCESS, "Successfully created task")
         return super().form_valid(form)
@@ -55,19 +57,22 @@ class EditTaskView(LoginRequiredMixin, TeamMemberProhibitedMixin, UpdateView):
     redirect_if_not_team_member = 'dashboard'
 
     def get_object(self):
+        # A copy for the form, which puts the submitted data on it even when it is rejected; the page shows the task as stored.
         task_id = self.kwargs['task_id']
-        task = Task.objects.get(id=task_id)
-        return task
+        task = get_request_object(self.request, Task, task_id)
+        return copy(task)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         task_id = self.kwargs['task_id']
-        current_task = Task.objects.get(id=task_id)
+        current_task = get_request_object(self.request, Task, task_id)
         context['task'] = current_task
-        context['team'] = Team.objects.get(id=current_task.author.id)
+        context['team'] = get_request_object(self.request, Team, current_task.author_id)
         return context
     
     def form_valid(self, form):
+        if 'due_date' in form.changed_data:
+            form.instance.overdue_notified = False
         messages.add_message(self.request, messages.SUCCESS, "Task Updated!")  # Add success message
         return super().form_valid(form)
 
@@ -77,8 +82,8 @@ class EditTaskView(LoginRequiredMixin, TeamMemberProhibitedMixin, UpdateView):
 
     def get_success_url(self):
         task_id = self.kwargs['task_id']
-        current_task = Task.objects.get(id=task_id)
-        team_id = current_task.author.id
+        current_task = get_request_object(self.request, Task, task_id)
+        team_id = current_task.author_id
         return reverse('show_team', kwargs={'team_id': team_id})
     
 class DeleteTaskView(LoginRequiredMixin, TeamAuthorProhibitedMixin, DeleteView):
@@ -92,20 +97,20 @@ class DeleteTaskView(LoginRequiredMixin, TeamAuthorProhibitedMixin, DeleteView):
 
     def get_object(self):
         task_id = self.kwargs['task_id']
-        task = Task.objects.get(id=task_id)
+        task = get_request_object(self.request, Task, task_id)
         return task
 
     def get(self, request, *args, **kwargs):
         task_id = self.kwargs['task_id']
-        current_task = Task.objects.get(id=task_id)
-        team_id = current_task.author.id
+        current_task = get_request_object(self.request, Task, task_id)
+        team_id = current_task.author_id
         messages.add_message(self.request, messages.ERROR, "GET requests are not allowed. Please use the provided button.")
         return redirect('show_team', team_id=team_id)
 
     def get_success_url(self):
         task_id = self.kwargs['task_id']
-        current_task = Task.objects.get(id=task_id)
-        team_id = current_task.author.id
+        current_task = get_request_object(self.request, Task, task_id)
+        team_id = current_task.author_id
         messages.add_message(self.request, messages.SUCCESS, "Task deleted!")
         return reverse('show_team', kwargs={'team_id': team_id})
     
@@ -114,10 +119,12 @@ class DeleteTaskView(LoginRequiredMixin, TeamAuthorProhibitedMixin, DeleteView):
 def toggle_task_status(request, task_id):
     current_user = request.user
     try:
-        task_to_toggle = Task.objects.get(id=task_id)
+        task_to_toggle = get_team_access(request, task_id=task_id).task
         current_team = task_to_toggle.author
         task_to_toggle.toggle_task_status()
         task_to_toggle.save()
+        if task_to_toggle.is_complete:
+            events.publish(events.TASK_COMPLETED, task_id=task_to_toggle.pk, actor_id=current_user.pk)
         messages.add_message(request, messages.SUCCESS, "Task status changed!")
 
     except ObjectDoesNotExist:
@@ -131,7 +138,7 @@ def toggle_task_status(request, task_id):
 def toggle_task_archive(request, task_id):
     current_user = request.user
     try:
-        task_to_toggle = Task.objects.get(id=task_id)
+        task_to_toggle = get_team_access(request, task_id=task_id).task
         current_team = task_to_toggle.author
         task_to_toggle.toggle_archive()
         task_to_toggle.save()
@@ -151,15 +158,16 @@ def toggle_task_archive(request, task_id):
 @team_member_prohibited_to_view_team
 def assign_member_to_task(request, task_id, user_id):
     current_logged_in_user = request.user
-    current_task = Task.objects.get(id=task_id)
+    current_task = get_team_access(request, task_id=task_id).task
     current_team = current_task.author
     selected_user = User.objects.get(id = user_id)
-    if selected_user in current_team.members.all():
-        if selected_user in current_task.assigned_members.all():
+    if current_team.members.filter(id=selected_user.id).exists():
+        if current_task.assigned_members.filter(id=selected_user.id).exists():
             current_task.assigned_members.remove(selected_user)
             messages.add_message(request, messages.WARNING, f"Removed {selected_user.full_name()}")
         else:
             current_task.assigned_members.add(selected_user)
+            events.publish(events.TASK_ASSIGNED, task_id=current_task.pk, user_ids=[selected_user.pk], actor_id=current_logged_in_user.pk)
             messages.add_message(request, messages.INFO, f"Added {selected_user.full_name()}")
 
     return redirect('show_team', current_team.id)
\ No newline at end of file
@@ -1,3 +1,4 @@
+from copy import copy
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
@@ -6,10 +7,11 @@ from django.shortcuts import redirect, render
 from django.views.generic.edit import UpdateView, DeleteView, CreateView
 from django.urls import reverse
 from tasks.forms import TeamForm
-from tasks.helpers import calculate_task_complete_score, team_member_prohibited_to_view_team
-from tasks.models import Team, Notification
+from tasks.helpers import get_request_object, get_team_access, team_member_prohibited_to_view_team, team_task_page
+from tasks.fragments import team_page_context
+from tasks import events
+from tasks.models import Team
 from django.shortcuts import render
-from django.core.exceptions import ObjectDoesNotExist
 from .mixins import TeamAuthorProhibitedMixin
 
 
@@ -31,12 +33,7 @@ class CreateTeamView(LoginRequiredMixin, CreateView):
         response = super().form_valid(form)
         titleCleaned = form.cleaned_data.get("title")
         self.object.members.add(current_user)
-        notification = Notification.objects.create(
-            user=current_user,
-            title="New Team Created: " + titleCleaned,
-            description="You have created a new team",
-            actionable=False
-        )
+        events.publish(events.TEAM_CREATED, team_id=self.object.pk, user_id=current_user.pk)
         messages.add_message(self.request, messages.SUCCESS, f"Created Team: {titleCleaned}!")
         return response
 
@@ -51,16 +48,26 @@ class CreateTeamView(LoginRequiredMixin, CreateView):
 @team_member_prohibited_to_view_team
 def show_team(request, team_id):
     """Show the team details: team name, description, members"""
-    try:
-        members, current_team, tasks = calculate_task_complete_score(team_id)
-        unarchived_tasks = tasks.filter(is_archived=False)
-        archived_tasks = tasks.filter(is_archived=True)
+    current_team = get_team_access(request, team_id=team_id).team
+    return render(request, 'show_team.html', team_page_context(request, current_team))
 
-    except ObjectDoesNotExist:
-        return redirect('dashboard')
+@login_required
+@team_member_prohibited_to_view_team
+def team_task_rows(request, team_id):
+    """Render the page of the team's unarchived tasks following the `after` cursor"""
+    current_team = get_team_access(request, team_id=team_id).team
+    tasks = team_task_page(current_team, cursor=request.GET.get('after'))
+    team_members = list(current_team.members.all())
+    return render(request, 'partials/task_table_rows.html', {'team': current_team, 'tasks': tasks, 'team_members': team_members})
 
-    else:
-        return render(request, 'show_team.html', {'team': current_team, 'unarchived': unarchived_tasks, 'archived': archived_tasks, 'members': members})
+@login_required
+@team_member_prohibited_to_view_team
+def archived_task_rows(request, team_id):
+    """Render the page of the team's archived tasks following the `after` cursor"""
+    current_team = get_team_access(request, team_id=team_id).team
+    tasks = team_task_page(current_team, archived=True, cursor=request.GET.get('after'))
+    team_members = list(current_team.members.all())
+    return render(request, 'partials/archived_task_rows.html', {'team': current_team, 'tasks': tasks, 'team_members': team_members})
     
 class TeamUpdateView(LoginRequiredMixin, TeamAuthorProhibitedMixin, UpdateView):
     """Display team editing screen, and handle team details modifications."""
@@ -71,10 +78,16 @@ class TeamUpdateView(LoginRequiredMixin, TeamAuthorProhibitedMixin, UpdateView):
     redirect_if_not_team_author = 'dashboard'
 
     def get_object(self):
-        """Return the object (team) to be updated."""
+        """Return a copy of the object (team) to be updated, which the form may fill with rejected data."""
         team_id = self.kwargs['team_id']
-        team = Team.objects.get(id=team_id)
-        return team
+        team = get_request_object(self.request, Team, team_id)
+        return copy(team)
+
+    def get_context_data(self, **kwargs):
+        """Show the team as stored, rather than the form's copy."""
+        context = super().get_context_data(**kwargs)
+        context['team'] = get_request_object(self.request, Team, self.kwargs['team_id'])
+        return context
     
     def get_success_url(self):
         """Return redirect URL after successful update."""
@@ -92,18 +105,15 @@ class DeleteTeamView(LoginRequiredMixin, TeamAuthorProhibitedMixin, DeleteView):
 
     def get_object(self):
         team_id = self.kwargs['team_id']
-        team = Team.objects.get(id=team_id)
+        team = get_request_object(self.request, Team, team_id)
         return team
     
     def get(self, request, *args, **kwargs):
         team_id = self.kwargs['team_id']
-        current_team = Team.objects.get(id=team_id)
         messages.add_message(self.request, messages.ERROR, "GET requests are not allowed. Please use the provided button.")
         return redirect('show_team', team_id=team_id)
 
     def get_success_url(self):
-        team_id = self.kwargs['team_id']
-        current_team = Team.objects.get(id=team_id)
         messages.add_message(self.request, messages.SUCCESS, "Team deleted!")
         return reverse('dashboard')
         #return reverse(dashboard)
@@ -111,9 +121,5 @@ class DeleteTeamView(LoginRequiredMixin, TeamAuthorProhibitedMixin, DeleteView):
 @login_required
 @team_member_prohibited_to_view_team
 def leaderboard_view(request, team_id):
-    try:
-        members, current_team, tasks = calculate_task_complete_score(team_id)
-        return redirect('show_team', current_team.id)
-
-    except ObjectDoesNotExist:
-        return redirect('dashboard')
\ No newline at end of file
+    current_team = get_team_access(request, team_id=team_id).team
+    return redirect('show_team', current_team.id)
\ No newline at end of file